@@ -1,63 +1,148 @@
+"""
+Process-wide settings, resolved once from the environment.
+
+Values are frozen at import time — edits to env vars or .env require a restart.
+Set DOTENV_SKIP=1 in production to rely on real env vars and skip .env parsing.
+.env is parsed into a local dict rather than loaded into os.environ; real env vars win.
+"""
+
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Vapi
-VAPI_API_KEY = os.getenv("VAPI_API_KEY", "")
-VAPI_PUBLIC_KEY = os.getenv("VAPI_PUBLIC_KEY", "")
-VAPI_ASSISTANT_ID = os.getenv("VAPI_ASSISTANT_ID", "")
-VAPI_PHONE_NUMBER_ID = os.getenv("VAPI_PHONE_NUMBER_ID", "")
-
-# Vapi Tool IDs (comma-separated in env, or set individually)
-VAPI_TOOL_IDS = os.getenv("VAPI_TOOL_IDS", "").split(",") if os.getenv("VAPI_TOOL_IDS") else []
-
-# Neo4j
-NEO4J_URI = os.getenv("NEO4J_URI", "")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "")
-
-# Tavily
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
-
-# Senso Context OS
-SENSO_API_KEY = os.getenv("SENSO_API_KEY", "")
-SENSO_BASE_URL = os.getenv("SENSO_BASE_URL", "https://sdk.senso.ai/api/v1")
-
-# Overshoot Vision AI
-OVERSHOOT_API_KEY = os.getenv("OVERSHOOT_API_KEY", "")
-OVERSHOOT_BASE_URL = os.getenv("OVERSHOOT_BASE_URL", "https://api.overshoot.ai")
-
-# Modulate Velma 2 Voice Intelligence
-MODULATE_API_KEY = os.getenv("MODULATE_API_KEY", "")
-
-# Airbyte Agent Connectors
-STRIPE_API_KEY = os.getenv("STRIPE_API_KEY", "")
-SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN", "")
-SLACK_CHANNEL_ID = os.getenv("SLACK_CHANNEL_ID", "")
-
-# User Consult Call
-USER_PHONE_NUMBER = os.getenv("USER_PHONE_NUMBER", "")   # Phone agent calls YOU
-BACKEND_URL = os.getenv("BACKEND_URL", "https://agenthackathon.onrender.com")
-
-# Gmail
-# Option A (simplest): App Password — Google Account → Security → 2-Step → App Passwords
-GMAIL_SENDER_EMAIL = os.getenv("GMAIL_SENDER_EMAIL", "")
-GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD", "")
-# Option B: OAuth2 — run one-time local auth to get these three values
-GMAIL_CLIENT_ID = os.getenv("GMAIL_CLIENT_ID", "")
-GMAIL_CLIENT_SECRET = os.getenv("GMAIL_CLIENT_SECRET", "")
-GMAIL_REFRESH_TOKEN = os.getenv("GMAIL_REFRESH_TOKEN", "")
-# Recipient (who receives the emails — can be same as sender)
-GMAIL_RECIPIENT_EMAIL = os.getenv("GMAIL_RECIPIENT_EMAIL", "")
-# Dashboard URL embedded in email buttons
-DASHBOARD_URL = os.getenv("DASHBOARD_URL", "https://agenthackathon.onrender.com")
-
-# Modulate Velma 2 (voice emotion + PII + diarization)
-MODULATE_API_KEY = os.getenv("MODULATE_API_KEY", "")
-
-# Reka Vision (bill image / document analysis)
-REKA_API_KEY = os.getenv("REKA_API_KEY", "")
-
-# Yutori Scouts (proactive web monitoring)
-YUTORI_API_KEY = os.getenv("YUTORI_API_KEY", "")
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+if os.environ.get("DOTENV_SKIP"):
+    _ENV = os.environ
+else:
+    from dotenv import dotenv_values
+
+    _ENV = {**dotenv_values(), **os.environ}
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    # Vapi
+    VAPI_API_KEY: str = ""
+    VAPI_PUBLIC_KEY: str = ""
+    VAPI_ASSISTANT_ID: str = ""
+    VAPI_PHONE_NUMBER_ID: str = ""
+    # Vapi Tool IDs (comma-separated in env)
+    VAPI_TOOL_IDS: tuple[str, ...] = ()
+
+    # Neo4j
+    NEO4J_URI: str = ""
+    NEO4J_USER: str = "neo4j"
+    NEO4J_PASSWORD: str = ""
+    # Driver pool: connections, seconds to wait for one, seconds before recycling
+    # (under the ~1h idle-kill of Aura / hosted proxies)
+    NEO4J_POOL_SIZE: int = 50
+    NEO4J_ACQ_TIMEOUT: int = 30
+    NEO4J_MAX_LIFETIME: int = 1800
+
+    # Tavily
+    TAVILY_API_KEY: str = ""
+
+    # Senso Context OS
+    SENSO_API_KEY: str = ""
+    SENSO_BASE_URL: str = "https://sdk.senso.ai/api/v1"
+
+    # Overshoot Vision AI
+    OVERSHOOT_API_KEY: str = ""
+    OVERSHOOT_BASE_URL: str = "https://api.overshoot.ai"
+
+    # Modulate Velma 2 (voice emotion + PII + diarization)
+    MODULATE_API_KEY: str = ""
+
+    # Airbyte Agent Connectors
+    STRIPE_API_KEY: str = ""
+    SLACK_BOT_TOKEN: str = ""
+    SLACK_CHANNEL_ID: str = ""
+
+    # User Consult Call
+    USER_PHONE_NUMBER: str = ""   # Phone agent calls YOU
+    BACKEND_URL: str = "https://agenthackathon.onrender.com"
+
+    # Gmail
+    # Option A (simplest): App Password — Google Account → Security → 2-Step → App Passwords
+    GMAIL_SENDER_EMAIL: str = ""
+    GMAIL_APP_PASSWORD: str = ""
+    # Option B: OAuth2 — run one-time local auth to get these three values
+    GMAIL_CLIENT_ID: str = ""
+    GMAIL_CLIENT_SECRET: str = ""
+    GMAIL_REFRESH_TOKEN: str = ""
+    # Recipient (who receives the emails — can be same as sender)
+    GMAIL_RECIPIENT_EMAIL: str = ""
+    # Dashboard URL embedded in email buttons
+    DASHBOARD_URL: str = "https://agenthackathon.onrender.com"
+
+    # Reka Vision (bill image / document analysis)
+    REKA_API_KEY: str = ""
+
+    # Yutori Scouts (proactive web monitoring)
+    YUTORI_API_KEY: str = ""
+
+    # Render Postgres (call logs + bill scans)
+    DATABASE_URL: str = ""
+
+    # Demo protection — action endpoints require X-Demo-Secret when set
+    DEMO_SECRET: str = ""
+
+    # Browser origins allowed to call the API cross-origin (comma-separated in env).
+    # The built dashboard is served same-origin; these cover the Vite dev server / VITE_API_URL setups.
+    CORS_ORIGINS: tuple[str, ...] = ("http://localhost:5173", "https://agenthackathon.onrender.com")
+
+    # Background monitor: seconds between scans (default 15 minutes)
+    SCAN_INTERVAL: int = 900
+
+
+def _read(name: str, default):
+    raw = _ENV.get(name)
+    if isinstance(default, tuple):
+        return tuple(raw.split(",")) if raw else default
+    if isinstance(default, int):
+        return int(raw) if raw else default
+    return raw if raw is not None else default
+
+
+@lru_cache(maxsize=1)
+def settings() -> Settings:
+    """Build the settings snapshot once; later calls return the cached instance."""
+    return Settings(**{f.name: _read(f.name, f.default) for f in fields(Settings)})
+
+
+# Module-level aliases so `config.X` / `from config import X` keep working.
+_settings = settings()
+VAPI_API_KEY = _settings.VAPI_API_KEY
+VAPI_PUBLIC_KEY = _settings.VAPI_PUBLIC_KEY
+VAPI_ASSISTANT_ID = _settings.VAPI_ASSISTANT_ID
+VAPI_PHONE_NUMBER_ID = _settings.VAPI_PHONE_NUMBER_ID
+VAPI_TOOL_IDS = _settings.VAPI_TOOL_IDS
+NEO4J_URI = _settings.NEO4J_URI
+NEO4J_USER = _settings.NEO4J_USER
+NEO4J_PASSWORD = _settings.NEO4J_PASSWORD
+NEO4J_POOL_SIZE = _settings.NEO4J_POOL_SIZE
+NEO4J_ACQ_TIMEOUT = _settings.NEO4J_ACQ_TIMEOUT
+NEO4J_MAX_LIFETIME = _settings.NEO4J_MAX_LIFETIME
+TAVILY_API_KEY = _settings.TAVILY_API_KEY
+SENSO_API_KEY = _settings.SENSO_API_KEY
+SENSO_BASE_URL = _settings.SENSO_BASE_URL
+OVERSHOOT_API_KEY = _settings.OVERSHOOT_API_KEY
+OVERSHOOT_BASE_URL = _settings.OVERSHOOT_BASE_URL
+MODULATE_API_KEY = _settings.MODULATE_API_KEY
+STRIPE_API_KEY = _settings.STRIPE_API_KEY
+SLACK_BOT_TOKEN = _settings.SLACK_BOT_TOKEN
+SLACK_CHANNEL_ID = _settings.SLACK_CHANNEL_ID
+USER_PHONE_NUMBER = _settings.USER_PHONE_NUMBER
+BACKEND_URL = _settings.BACKEND_URL
+GMAIL_SENDER_EMAIL = _settings.GMAIL_SENDER_EMAIL
+GMAIL_APP_PASSWORD = _settings.GMAIL_APP_PASSWORD
+GMAIL_CLIENT_ID = _settings.GMAIL_CLIENT_ID
+GMAIL_CLIENT_SECRET = _settings.GMAIL_CLIENT_SECRET
+GMAIL_REFRESH_TOKEN = _settings.GMAIL_REFRESH_TOKEN
+GMAIL_RECIPIENT_EMAIL = _settings.GMAIL_RECIPIENT_EMAIL
+DASHBOARD_URL = _settings.DASHBOARD_URL
+REKA_API_KEY = _settings.REKA_API_KEY
+YUTORI_API_KEY = _settings.YUTORI_API_KEY
+DATABASE_URL = _settings.DATABASE_URL
+DEMO_SECRET = _settings.DEMO_SECRET
+CORS_ORIGINS = _settings.CORS_ORIGINS
+SCAN_INTERVAL = _settings.SCAN_INTERVAL
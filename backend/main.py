@@ -1,44 +1,79 @@
+import asyncio
+import hmac
 import logging
-import os
+import logging.handlers
+import queue
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import ORJSONResponse
 
 from services.neo4j_service import neo4j_service
-from services import senso_service, postgres_service
+from services import senso_service, postgres_service, airbyte_service, vapi_service
 from routers import vapi_tools, vapi_webhook, tasks, monitoring, demo, user_call
 import config
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-)
+import static_files
+
+# Log calls only enqueue the record; a listener thread formats and writes to stderr,
+# so a slow log pipe never stalls the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream, respect_handler_level=True)
+logging.root.setLevel(logging.INFO)
+logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
 
+def _log_seed_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Senso compliance seed failed", exc_info=task.exception())
+
+
+async def _start_neo4j():
+    await neo4j_service.connect()
+    # Seeding waits on this connection only — not on Postgres
+    if neo4j_service.available:
+        await neo4j_service.ensure_constraints()
+        await neo4j_service.seed_demo_data()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Haggle backend starting up")
-    neo4j_service.connect()
-    if neo4j_service.available:
-        neo4j_service.seed_demo_data()
-    # Seed Senso with compliance docs for grounded knowledge
-    await senso_service.seed_compliance_docs()
-    # Connect to Render Postgres for call logging
-    await postgres_service.connect()
+    # Seed Senso with compliance docs for grounded knowledge — in the background,
+    # so the external ingest round-trips don't delay accepting traffic
+    senso_seed = asyncio.create_task(senso_service.seed_compliance_docs())
+    senso_seed.add_done_callback(_log_seed_failure)
+    app.state.senso_seed_task = senso_seed
+    # Neo4j and Render Postgres (call logging) are independent — connect concurrently.
+    # A failure in one is logged and leaves the other (and the app) running.
+    results = await asyncio.gather(_start_neo4j(), postgres_service.connect(), return_exceptions=True)
+    for name, result in zip(("neo4j", "postgres"), results):
+        if isinstance(result, Exception):
+            logger.error("%s startup failed: %s", name, result)
     # NOTE: GLiNER2 preload removed — 205M param model exceeds Render free tier 512MB limit
     # fastino_service will lazy-load on first use if memory allows
     yield
-    # Shutdown
+    # Shutdown — give an in-flight seed a moment to finish its ingests, then drop it
+    # (failures are already logged by _log_seed_failure)
+    done, _ = await asyncio.wait({senso_seed}, timeout=5)
+    if not done:
+        senso_seed.cancel()
     await postgres_service.disconnect()
-    neo4j_service.close()
+    await airbyte_service.close()
+    await senso_service.close()
+    await vapi_service.close()
+    await neo4j_service.close()
     logger.info("Haggle backend shut down")
+    # Flushes whatever is still queued
+    _log_listener.stop()
 
 
 app = FastAPI(
@@ -46,58 +81,105 @@ app = FastAPI(
     description="Backend for Haggle voice agent — handles Vapi webhooks, tool calls, task management, and SSE streaming.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # ── Demo protection: block action endpoints unless secret header present ──
-DEMO_SECRET = os.getenv("DEMO_SECRET", "")
-# Endpoints that cost money / trigger calls — require X-Demo-Secret header
-PROTECTED_PREFIXES = [
+DEMO_SECRET = config.DEMO_SECRET
+DEMO_SECRET_BYTES = DEMO_SECRET.encode("utf-8")
+DEMO_ENABLED = bool(DEMO_SECRET_BYTES)
+# Endpoints that cost money / trigger calls — require X-Demo-Secret header.
+# A tuple so str.startswith checks every prefix in one call.
+PROTECTED_PREFIXES = (
     "/api/demo/run", "/api/demo/reset", "/api/demo/user-consult",
     "/api/bills/analyze", "/api/bills/compare", "/api/bills/document",
     "/api/monitor/scan", "/api/monitor/scout",
     "/api/user/call",
-]
-
-class DemoGuardMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if DEMO_SECRET and request.method == "POST":
-            path = request.url.path
-            if any(path.startswith(p) for p in PROTECTED_PREFIXES):
-                token = request.headers.get("x-demo-secret", "")
-                if token != DEMO_SECRET:
-                    return JSONResponse(
-                        status_code=403,
-                        content={"error": "Demo locked. Not authorized."},
-                    )
-        return await call_next(request)
-
-app.add_middleware(DemoGuardMiddleware)
-
-# CORS — allow dashboard frontend
+)
+
+# The whole 403 is built once; a blocked request costs two send() calls
+_FORBIDDEN_BODY = orjson.dumps({"error": "Demo locked. Not authorized."})
+_FORBIDDEN_START = {
+    "type": "http.response.start",
+    "status": 403,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_FORBIDDEN_BODY)).encode()),
+    ],
+}
+_FORBIDDEN_MESSAGE = {"type": "http.response.body", "body": _FORBIDDEN_BODY}
+
+
+class DemoGuardMiddleware:
+    """Pure ASGI guard — unprotected requests pass straight through with no Request/task wrapping."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"].startswith(PROTECTED_PREFIXES)
+        ):
+            # One pass over the raw header tuples — no Headers/Request object is built
+            token = b""
+            for key, value in scope["headers"]:
+                if key == b"x-demo-secret":
+                    token = value
+                    break
+            if not hmac.compare_digest(token, DEMO_SECRET_BYTES):
+                await send(_FORBIDDEN_START)
+                await send(_FORBIDDEN_MESSAGE)
+                return
+        await self.app(scope, receive, send)
+
+# Without a secret the guard would never block anything — don't put it in the stack at all
+if DEMO_ENABLED:
+    app.add_middleware(DemoGuardMiddleware)
+
+# CORS — allow dashboard frontend. Added last so it wraps outermost: preflights are
+# answered before DemoGuard runs, and requests without an Origin header pass straight through.
+# The dashboard sends no cookies, so credentials stay off (browsers reject "*" with them anyway).
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-    allow_credentials=True,
+    allow_origins=list(config.CORS_ORIGINS),
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "x-demo-secret"],
+    allow_credentials=False,
 )
 
-# Routers
-app.include_router(vapi_tools.router, tags=["Vapi Tools"])
-app.include_router(vapi_webhook.router, tags=["Vapi Webhooks"])
-app.include_router(tasks.router, tags=["Tasks"])
-app.include_router(monitoring.router, tags=["Monitoring"])
-app.include_router(demo.router, tags=["Demo"])
-app.include_router(user_call.router, tags=["User Consult"])
+# Routers (tags are set on each APIRouter, so routes aren't re-tagged at include time)
+for _router_module in (vapi_tools, vapi_webhook, tasks, monitoring, demo, user_call):
+    app.include_router(_router_module.router)
+
+
+# Dashboards poll this; the answer only changes when a connection comes up or drops
+_STATUS_TTL = 2.0
+_status_cache = {"ts": float("-inf"), "body": b""}
 
 
 @app.get("/api/status")
 async def api_status():
+    now = time.monotonic()
+    if now - _status_cache["ts"] >= _STATUS_TTL:
+        _status_cache["body"] = orjson.dumps(_status())
+        _status_cache["ts"] = now
+    return Response(_status_cache["body"], media_type="application/json")
+
+
+def _senso_seed_ready() -> bool:
+    seed = getattr(app.state, "senso_seed_task", None)
+    return seed is not None and seed.done() and not seed.cancelled() and seed.exception() is None
+
+
+def _status() -> dict:
     return {
         "service": "Haggle Backend",
         "status": "running",
         "neo4j": "connected" if neo4j_service.available else "not configured",
         "senso": "configured" if config.SENSO_API_KEY else "not configured",
+        "senso_seed_ready": _senso_seed_ready(),
         "stripe": "configured" if config.STRIPE_API_KEY else "not configured",
         "overshoot": "configured" if config.OVERSHOOT_API_KEY else "not configured",
         "tavily": "configured" if config.TAVILY_API_KEY else "not configured",
@@ -109,28 +191,65 @@ async def api_status():
     }
 
 
-@app.get("/health")
-async def health():
-    return {"status": "ok"}
+_HEALTH_BODY = b'{"status":"ok"}'
+_HEALTH_START = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_HEALTH_BODY)).encode()),
+    ],
+}
+_HEALTH_MESSAGE = {"type": "http.response.body", "body": _HEALTH_BODY}
+
+
+class _HealthCheck:
+    """Pure ASGI /health for the platform probe — skips FastAPI's dependency and response handling."""
+
+    async def __call__(self, scope, receive, send):
+        await send(_HEALTH_START)
+        await send(_HEALTH_MESSAGE)
+
+
+# Exact-path GET/HEAD handlers that `asgi` (below) answers before FastAPI's middleware
+# and route scan. Each is also registered on `app`, so `uvicorn main:app` serves them too.
+_FAST_ROUTES = {"/health": _HealthCheck()}
+app.add_route("/health", _FAST_ROUTES["/health"], methods=["GET"], include_in_schema=False)
 
 
 # ── Serve Dashboard ──────────────────────────────────────────
 DASHBOARD_DIR = Path(__file__).parent / "static"
 
 if DASHBOARD_DIR.exists() and (DASHBOARD_DIR / "index.html").exists():
-    # Serve /assets/* statically (won't conflict with /api/*)
+    # Serve /assets/* from memory, precompressed at startup (won't conflict with /api/*)
     if (DASHBOARD_DIR / "assets").exists():
-        app.mount("/assets", StaticFiles(directory=DASHBOARD_DIR / "assets"), name="static-assets")
+        app.mount("/assets", static_files.PrecompressedAssets(DASHBOARD_DIR / "assets"), name="static-assets")
+
+    # Serve static files in root (logo, demo-bill, index) — stat'd once here, answered with ETags
+    for _path, _name, _cache in (
+        ("/logo.png", "logo.png", static_files.CACHE_DAY),
+        ("/demo-bill.png", "demo-bill.png", static_files.CACHE_DAY),
+        ("/", "index.html", static_files.CACHE_REVALIDATE),
+    ):
+        if (DASHBOARD_DIR / _name).exists():
+            _FAST_ROUTES[_path] = static_files.CachedFile(DASHBOARD_DIR / _name, _cache)
+            app.add_route(_path, _FAST_ROUTES[_path], methods=["GET"], include_in_schema=False)
+
+
+class _FastPathApp:
+    """Outer ASGI app: one dict lookup serves health + root static files, everything else goes to FastAPI."""
+
+    def __init__(self, app):
+        self.app = app
 
-    # Serve static files in root (logo, demo-bill, etc.)
-    @app.get("/logo.png")
-    async def serve_logo():
-        return FileResponse(DASHBOARD_DIR / "logo.png")
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            handler = _FAST_ROUTES.get(scope["path"])
+            if handler is not None:
+                await handler(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
 
-    @app.get("/demo-bill.png")
-    async def serve_demo_bill():
-        return FileResponse(DASHBOARD_DIR / "demo-bill.png")
 
-    @app.get("/")
-    async def serve_index():
-        return FileResponse(DASHBOARD_DIR / "index.html")
+# Server entrypoint: `uvicorn main:asgi` (lifespan and all other traffic pass through to `app`)
+asgi = _FastPathApp(app)
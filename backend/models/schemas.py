@@ -1,11 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
-from enum import Enum
+from enum import StrEnum
 
 
 # ── Task Models ──────────────────────────────────────────────
 
-class TaskAction(str, Enum):
+# StrEnum: members are plain str values (str()/format() give the value).
+class TaskAction(StrEnum):
     CANCEL_SERVICE = "cancel_service"
     NEGOTIATE_RATE = "negotiate_rate"
     CONSULT_USER = "consult_user"
@@ -14,7 +15,7 @@ class TaskAction(str, Enum):
     ADD_CONTACT = "add_contact"
 
 
-class TaskStatus(str, Enum):
+class TaskStatus(StrEnum):
     PENDING = "pending"
     RESEARCHING = "researching"
     CALLING = "calling"
@@ -46,7 +47,7 @@ class Task(BaseModel):
     notes: Optional[str] = None
     status: TaskStatus = TaskStatus.PENDING
     research_context: Optional[str] = None
-    research_sources: list[str] = []
+    research_sources: list[str] = Field(default_factory=list)
     call_id: Optional[str] = None
     outcome: Optional[str] = None
     savings: Optional[float] = None
@@ -73,7 +74,7 @@ class VapiToolCallResult(BaseModel):
 
 # ── Entity Extraction ────────────────────────────────────────
 
-class EntityType(str, Enum):
+class EntityType(StrEnum):
     CONFIRMATION_NUMBER = "confirmation_number"
     PRICE = "price"
     DATE = "date"
@@ -98,7 +99,7 @@ class ExtractedEntity(BaseModel):
 
 # ── SSE Event Models ─────────────────────────────────────────
 
-class SSEEventType(str, Enum):
+class SSEEventType(StrEnum):
     TRANSCRIPT = "transcript"
     CALL_STATUS = "call_status"
     ENTITY_EXTRACTED = "entity_extracted"
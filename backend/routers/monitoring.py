@@ -6,35 +6,45 @@ Monitoring Endpoints
 - GET  /api/monitor/demo     — get pre-built demo detection for presentation
 """
 
+import asyncio
 import logging
 
-from fastapi import APIRouter, Request
+import orjson
+from fastapi import APIRouter, Request, Response
 
 from models.schemas import TaskCreate, TaskAction, SSEEvent, SSEEventType
-from services.task_store import store
+from services.task_store import store, encode_sse
 from services import airbyte_service, overshoot_service, senso_service, tavily_service, gmail_service, reka_service, yutori_service, postgres_service
 from services.neo4j_service import neo4j_service
-import config
+from config import (
+    VAPI_API_KEY, NEO4J_URI, TAVILY_API_KEY, SENSO_API_KEY, STRIPE_API_KEY,
+    SLACK_BOT_TOKEN, SLACK_CHANNEL_ID, OVERSHOOT_API_KEY, MODULATE_API_KEY,
+    REKA_API_KEY, YUTORI_API_KEY,
+)
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(tags=["Monitoring"])
+
+
+# Config is read once at startup, so which integrations are configured never changes
+_INTEGRATION_STATUS = orjson.dumps({
+    "vapi": bool(VAPI_API_KEY),
+    "neo4j": bool(NEO4J_URI),
+    "tavily": bool(TAVILY_API_KEY),
+    "senso": bool(SENSO_API_KEY),
+    "stripe": bool(STRIPE_API_KEY),
+    "slack": bool(SLACK_BOT_TOKEN and SLACK_CHANNEL_ID),
+    "overshoot": bool(OVERSHOOT_API_KEY),
+    "modulate": bool(MODULATE_API_KEY),
+    "reka": bool(REKA_API_KEY),
+    "yutori": bool(YUTORI_API_KEY),
+})
 
 
 @router.get("/api/monitor/status")
 async def integration_status():
     """Check which integrations are configured and available."""
-    return {
-        "vapi": bool(config.VAPI_API_KEY),
-        "neo4j": bool(config.NEO4J_URI),
-        "tavily": bool(config.TAVILY_API_KEY),
-        "senso": bool(config.SENSO_API_KEY),
-        "stripe": bool(config.STRIPE_API_KEY),
-        "slack": bool(config.SLACK_BOT_TOKEN and config.SLACK_CHANNEL_ID),
-        "overshoot": bool(config.OVERSHOOT_API_KEY),
-        "modulate": bool(config.MODULATE_API_KEY),
-        "reka": bool(config.REKA_API_KEY),
-        "yutori": bool(config.YUTORI_API_KEY),
-    }
+    return Response(_INTEGRATION_STATUS, media_type="application/json")
 
 
 @router.post("/api/monitor/scan")
@@ -45,79 +55,93 @@ async def trigger_scan():
     """
     detections = []
 
-    # 1. Check Stripe for billing anomalies
-    if config.STRIPE_API_KEY:
-        anomalies = await airbyte_service.detect_billing_anomalies(days=60)
-        for a in anomalies:
-            # Classify via Senso
-            classification = await senso_service.classify_threat(
-                f"{a['merchant']} {a['type']} amount changed from ${a.get('old_amount', '?')} to ${a.get('new_amount', '?')}"
-            )
-            a["classification"] = classification
-            detections.append(a)
-
-            # Auto-create task for billing increases
-            if a["type"] == "BILLING_INCREASE":
-                task = store.create_task(TaskCreate(
-                    company=a["merchant"],
-                    action="negotiate_rate",
-                    phone_number="+18005551234",  # Placeholder
-                    service_type="subscription",
-                    current_rate=a["new_amount"],
-                    target_rate=a["old_amount"],
-                    notes=f"Detected {a['increase_pct']}% rate increase via Stripe monitoring",
-                ))
-                await store.push_task_update(task)
-
-    # 2. Check Overshoot for financial broadcast alerts
-    if config.OVERSHOOT_API_KEY:
+    # 1 + 2. Stripe billing anomalies and Overshoot broadcast alerts are independent — fetch concurrently
+    anomalies, events = await asyncio.gather(
+        airbyte_service.detect_billing_anomalies(days=60) if STRIPE_API_KEY else _no_detections(),
         # In production: pass a live video URL
         # For hackathon: use demo detection
-        events = await overshoot_service.monitor_broadcast("demo")
-        detections.extend(events)
+        overshoot_service.monitor_broadcast("demo") if OVERSHOOT_API_KEY else _no_detections(),
+    )
 
-    # 3. Notify via Slack + Gmail
-    if detections:
-        await airbyte_service.send_slack_alert(
-            f"Haggle scan detected {len(detections)} anomalies"
-        )
-        await gmail_service.send_threat_alert(detections)
+    # Classify via Senso in one batch
+    classifications = await senso_service.classify_threats_batch([
+        f"{a['merchant']} {a['type']} amount changed from ${a.get('old_amount', '?')} to ${a.get('new_amount', '?')}"
+        for a in anomalies
+    ])
+    new_tasks = []
+    for a, classification in zip(anomalies, classifications):
+        a["classification"] = classification
+        detections.append(a)
+
+        # Auto-create task for billing increases
+        if a["type"] == "BILLING_INCREASE":
+            new_tasks.append(TaskCreate(
+                company=a["merchant"],
+                action="negotiate_rate",
+                phone_number="+18005551234",  # Placeholder
+                service_type="subscription",
+                current_rate=a["new_amount"],
+                target_rate=a["old_amount"],
+                notes=f"Detected {a['increase_pct']}% rate increase via Stripe monitoring",
+            ))
+
+    # All auto-created tasks reach the dashboard in one event
+    if new_tasks:
+        created = store.create_tasks(new_tasks)
+        await store.push_sse_bytes(encode_sse(
+            SSEEventType.TASK_UPDATED,
+            {"tasks": [store.dump_task(t) for t in created], "created": True},
+        ))
 
-    # Push scan results to SSE
-    await store.push_event(SSEEvent(
+    detections.extend(events)
+
+    # 3. Notify via Slack + Gmail and push scan results to SSE
+    notifications = [store.push_event(SSEEvent.model_construct(
         type=SSEEventType.TASK_UPDATED,
         data={"scan_results": detections, "count": len(detections)},
-    ))
+    ))]
+    if detections:
+        notifications.append(airbyte_service.send_slack_alert(
+            f"Haggle scan detected {len(detections)} anomalies"
+        ))
+        notifications.append(gmail_service.send_threat_alert(detections))
+    await asyncio.gather(*notifications)
 
     return {"detections": detections, "count": len(detections)}
 
 
+async def _no_detections() -> list[dict]:
+    return []
+
+
+# Demo detections are static — serialize once at import
+_DEMO_DETECTIONS = orjson.dumps({
+    "detections": [
+        {
+            "source": "airbyte_stripe",
+            "type": "BILLING_INCREASE",
+            "company": "Comcast",
+            "old_amount": 55.0,
+            "new_amount": 85.0,
+            "increase_pct": 54.5,
+            "classification": "BILLING_INCREASE",
+        },
+        overshoot_service.get_demo_detection(),
+        {
+            "source": "tavily_search",
+            "type": "COMPETITOR_RATE",
+            "company": "T-Mobile",
+            "summary": "T-Mobile 5G Home Internet available at $50/month in your area",
+            "relevance": "leverage for Comcast negotiation",
+        },
+    ],
+})
+
+
 @router.get("/api/monitor/demo")
 async def demo_detection():
     """Return pre-built detections for reliable demo flow."""
-    overshoot_detection = overshoot_service.get_demo_detection()
-
-    return {
-        "detections": [
-            {
-                "source": "airbyte_stripe",
-                "type": "BILLING_INCREASE",
-                "company": "Comcast",
-                "old_amount": 55.0,
-                "new_amount": 85.0,
-                "increase_pct": 54.5,
-                "classification": "BILLING_INCREASE",
-            },
-            overshoot_detection,
-            {
-                "source": "tavily_search",
-                "type": "COMPETITOR_RATE",
-                "company": "T-Mobile",
-                "summary": "T-Mobile 5G Home Internet available at $50/month in your area",
-                "relevance": "leverage for Comcast negotiation",
-            },
-        ],
-    }
+    return Response(_DEMO_DETECTIONS, media_type="application/json")
 
 
 @router.post("/api/monitor/ingest")
@@ -173,14 +197,14 @@ async def analyze_bill(request: Request):
             await store.push_task_update(task)
 
     # Store analysis in Neo4j
-    neo4j_service.add_entity(
+    await neo4j_service.add_entity(
         "bill_analysis",
         result.get("provider_name", "Unknown"),
         f"Reka Vision: total={result.get('total_amount')}, change={price_change}",
     )
 
     # Push to SSE
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.BILL_ANALYZED,
         data=result,
     ))
@@ -8,33 +8,35 @@ Task Management + SSE Stream
 """
 
 import asyncio
-import json
 import logging
 
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from models.schemas import TaskCreate, SSEEvent, SSEEventType
-from services.task_store import store
+from models.schemas import TaskCreate, SSEEventType
+from services.task_store import store, encode_sse
 from services.neo4j_service import neo4j_service
 from services import tavily_service, vapi_service
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(tags=["Tasks"])
 
 
 # ── Task CRUD ────────────────────────────────────────────────
 
+# Polled by the dashboard: hand the store's cached task JSON straight to orjson instead
+# of letting FastAPI walk model_dump() output through jsonable_encoder first.
+
 @router.get("/api/tasks")
 async def list_tasks():
     tasks = store.list_tasks()
-    return [t.model_dump() for t in tasks]
+    return ORJSONResponse([store.dump_task(t) for t in tasks])
 
 
 @router.post("/api/tasks")
 async def create_task(task_create: TaskCreate):
     task = store.create_task(task_create)
-    return task.model_dump()
+    return ORJSONResponse(store.dump_task(task))
 
 
 @router.get("/api/tasks/{task_id}")
@@ -42,7 +44,7 @@ async def get_task(task_id: str):
     task = store.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task.model_dump()
+    return ORJSONResponse(store.dump_task(task))
 
 
 # ── Knowledge Graph ──────────────────────────────────────────
@@ -50,7 +52,7 @@ async def get_task(task_id: str):
 @router.get("/api/graph")
 async def get_graph():
     """Return Neo4j graph data for dashboard visualization."""
-    return neo4j_service.get_graph_data()
+    return ORJSONResponse(await neo4j_service.get_graph_data())
 
 
 # ── Trigger Call ─────────────────────────────────────────────
@@ -66,7 +68,8 @@ async def trigger_task(task_id: str):
     store.update_task(task_id, status="researching")
     await store.push_task_update(task)
 
-    research = tavily_service.research_for_task(
+    research = await asyncio.to_thread(
+        tavily_service.research_for_task,
         company=task.company,
         action=task.action.value,
         service_type=task.service_type or "",
@@ -78,8 +81,7 @@ async def trigger_task(task_id: str):
     )
 
     # Step 2: Trigger Vapi outbound call
-    store.update_task(task_id, status="calling")
-    task = store.get_task(task_id)  # Refresh
+    task = store.update_task(task_id, status="calling")
     await store.push_task_update(task)
 
     call_result = await vapi_service.trigger_outbound_call(
@@ -94,8 +96,7 @@ async def trigger_task(task_id: str):
     )
 
     if "error" in call_result:
-        store.update_task(task_id, status="failed", outcome=call_result["error"])
-        task = store.get_task(task_id)
+        task = store.update_task(task_id, status="failed", outcome=call_result["error"])
         await store.push_task_update(task)
         return {"status": "error", "detail": call_result["error"]}
 
@@ -118,22 +119,32 @@ async def sse_stream(request: Request):
     """Server-Sent Events stream for real-time dashboard updates."""
 
     async def event_generator():
-        # Send initial state
-        tasks = store.list_tasks()
-        yield _format_sse(SSEEvent(
-            type=SSEEventType.TASK_UPDATED,
-            data={"tasks": [t.model_dump() for t in tasks]},
-        ))
-
-        while True:
-            if await request.is_disconnected():
-                break
-            try:
-                event = await asyncio.wait_for(store.event_queue.get(), timeout=15.0)
-                yield _format_sse(event)
-            except asyncio.TimeoutError:
-                # Send keepalive to prevent connection timeout
-                yield ": keepalive\n\n"
+        # Subscribe before the snapshot so no update falls between the two
+        queue = store.subscribe()
+        try:
+            # Send initial state, _SNAPSHOT_CHUNK tasks per frame so a big store is
+            # serialized piecewise (the loop gets control back between frames)
+            tasks = store.list_tasks()
+            parts = max(1, -(-len(tasks) // _SNAPSHOT_CHUNK))
+            for part in range(parts):
+                chunk = tasks[part * _SNAPSHOT_CHUNK:(part + 1) * _SNAPSHOT_CHUNK]
+                yield encode_sse(SSEEventType.TASK_UPDATED, {
+                    "tasks": [store.dump_task(t) for t in chunk],
+                    "snapshot_part": part + 1,
+                    "snapshot_parts": parts,
+                })
+
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    # Events are queued as finished SSE frames (see store._publish)
+                    yield await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    # Send keepalive to prevent connection timeout
+                    yield _KEEPALIVE
+        finally:
+            store.unsubscribe(queue)
 
     return StreamingResponse(
         event_generator(),
@@ -146,9 +157,8 @@ async def sse_stream(request: Request):
     )
 
 
-def _format_sse(event: SSEEvent) -> str:
-    data = json.dumps(event.model_dump())
-    return f"event: {event.type.value}\ndata: {data}\n\n"
+_KEEPALIVE = b": keepalive\n\n"
+_SNAPSHOT_CHUNK = 50
 
 
 # ── Admin: Update Vapi URLs ─────────────────────────────────
@@ -5,9 +5,9 @@ User Consult Call Endpoints
 """
 
 import asyncio
+import functools
 import logging
-import uuid
-from datetime import datetime, timezone
+import secrets
 
 from fastapi import APIRouter, HTTPException
 
@@ -20,10 +20,10 @@ from models.schemas import (
     ConfirmedAction,
 )
 from services.task_store import store
-from services import vapi_service, subscription_service, modulate_service
+from services import vapi_service, subscription_service, modulate_service, gmail_service, background, demo_script
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(tags=["User Consult"])
 
 
 # ── Real Vapi Outbound Call ───────────────────────────────────
@@ -43,7 +43,7 @@ async def call_user():
             detail="USER_PHONE_NUMBER not set. Use POST /api/demo/user-consult for a simulated demo.",
         )
 
-    ctx = subscription_service.build_subscription_context()
+    ctx = await subscription_service.build_subscription_context()
 
     # Create a consult task so the webhook can identify this call later
     task = store.create_task(TaskCreate(
@@ -68,7 +68,7 @@ async def call_user():
     call_id = result.get("id", "")
     store.update_task(task.id, call_id=call_id, status=TaskStatus.CALLING)
 
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.CALL_STATUS,
         data={
             "task_id": task.id,
@@ -107,8 +107,8 @@ async def demo_user_consult():
     # Clear any leftover state
     store.clear_confirmed_actions()
 
-    ctx = subscription_service.build_subscription_context()
-    call_id = f"consult_{uuid.uuid4().hex[:10]}"
+    ctx = await subscription_service.build_subscription_context()
+    call_id = f"consult_{secrets.token_hex(5)}"
 
     # Create the consult task
     task = store.create_task(TaskCreate(
@@ -122,7 +122,7 @@ async def demo_user_consult():
     store.update_task(task.id, call_id=call_id, status=TaskStatus.CALLING)
 
     # Kick off simulation as a background task so this endpoint returns immediately
-    asyncio.create_task(_run_consult_simulation(task.id, call_id, ctx))
+    background.spawn_demo_task(_run_consult_simulation(task.id, call_id, ctx))
 
     return {
         "status": "simulation_started",
@@ -190,7 +190,7 @@ async def _run_consult_simulation(task_id: str, call_id: str, ctx: dict):
     """Stream the pre-scripted user consult conversation, then fire service provider calls."""
 
     # Signal: call ringing
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.CALL_STATUS,
         data={
             "task_id": task_id,
@@ -203,62 +203,63 @@ async def _run_consult_simulation(task_id: str, call_id: str, ctx: dict):
     ))
     await asyncio.sleep(1.2)
 
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.CALL_STATUS,
         data={"task_id": task_id, "call_id": call_id, "status": "in_progress",
               "call_type": "user_consult", "message": "User consult call connected"},
     ))
     await asyncio.sleep(0.6)
 
-    # Stream transcript
-    for role, text, delay in _CONSULT_SCRIPT:
-        await asyncio.sleep(delay)
-        await store.push_event(SSEEvent(
-            type=SSEEventType.TRANSCRIPT,
-            data={
-                "task_id": task_id,
-                "call_id": call_id,
-                "role": role,
-                "text": text,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "call_type": "user_consult",
-            },
-        ))
-
-        # Simulate confirm_action tool firing after user says yes
-        if "cancel it" in text.lower() and role == "user":
-            await asyncio.sleep(0.4)
-            _fire_confirmed_action(
-                service="Planet Fitness",
-                action="cancel_service",
-                reason="User visits twice/month at $12.50/visit vs $10 day pass — not cost-effective",
-                monthly_savings=25.0,
-                phone_number="+18005555678",
-                call_id=call_id,
-            )
-
-        elif "yes, please do that" in text.lower() and role == "user":
-            await asyncio.sleep(0.4)
-            _fire_confirmed_action(
-                service="Comcast",
-                action="negotiate_rate",
-                reason="54% billing increase detected — competitor rates available as leverage",
-                monthly_savings=20.0,
-                phone_number="+18005551234",
-                call_id=call_id,
-            )
-
-    await asyncio.sleep(0.5)
+    # Stream transcript (frames and their timestamps are built once, before the loop)
+    frames = demo_script.precompile_transcript(_CONSULT_SCRIPT, task_id, call_id, call_type="user_consult")
+    # The confirm_action tool "fires" 0.4s after the user says yes. It goes on a loop timer
+    # so the transcript keeps the pacing its precompiled timestamps assume.
+    loop = asyncio.get_running_loop()
+    confirms = []
+    try:
+        for (role, text, _), (delay, frame) in zip(_CONSULT_SCRIPT, frames):
+            await asyncio.sleep(delay)
+            await store.push_sse_bytes(frame)
+
+            # Simulate confirm_action tool firing after user says yes
+            if "cancel it" in text.lower() and role == "user":
+                confirms.append(loop.call_later(0.4, functools.partial(
+                    _fire_confirmed_action,
+                    service="Planet Fitness",
+                    action="cancel_service",
+                    reason="User visits twice/month at $12.50/visit vs $10 day pass — not cost-effective",
+                    monthly_savings=25.0,
+                    phone_number="+18005555678",
+                    call_id=call_id,
+                )))
+
+            elif "yes, please do that" in text.lower() and role == "user":
+                confirms.append(loop.call_later(0.4, functools.partial(
+                    _fire_confirmed_action,
+                    service="Comcast",
+                    action="negotiate_rate",
+                    reason="54% billing increase detected — competitor rates available as leverage",
+                    monthly_savings=20.0,
+                    phone_number="+18005551234",
+                    call_id=call_id,
+                )))
+
+        # Longer than the confirm delay, so every confirmation lands before the call ends
+        await asyncio.sleep(0.5)
+    finally:
+        # No-ops once fired; drops any still pending if the simulation is cancelled
+        for handle in confirms:
+            handle.cancel()
 
     # Call ended
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.CALL_STATUS,
         data={"task_id": task_id, "call_id": call_id, "status": "ended",
               "call_type": "user_consult", "duration_seconds": 52},
     ))
 
     # ── Modulate Velma 2: analyze user consult voice ──────────
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.TASK_UPDATED,
         data={
             "task_id": task_id,
@@ -273,7 +274,7 @@ async def _run_consult_simulation(task_id: str, call_id: str, ctx: dict):
         transcript=[{"role": r, "text": t} for r, t, _ in _CONSULT_SCRIPT],
         call_type="user_consult",
     )
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.VOICE_ANALYSIS,
         data={"task_id": task_id, "call_id": call_id, **consult_analysis},
     ))
@@ -281,15 +282,15 @@ async def _run_consult_simulation(task_id: str, call_id: str, ctx: dict):
 
     # Mark consult task complete
     confirmed = store.get_confirmed_actions()
-    store.update_task(task_id, status=TaskStatus.COMPLETED,
-                      outcome=f"User confirmed {len(confirmed)} action(s) — dispatching service calls")
-    await store.push_task_update(store.get_task(task_id))
+    completed = store.update_task(task_id, status=TaskStatus.COMPLETED,
+                                  outcome=f"User confirmed {len(confirmed)} action(s) — dispatching service calls")
+    await store.push_task_update(completed)
 
     await asyncio.sleep(0.8)
 
     # Announce service call dispatch — include Velma recommendation as context
     velma_rec = consult_analysis.get("negotiation_recommendation", "")
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.TASK_UPDATED,
         data={
             "message": (
@@ -329,7 +330,7 @@ def _fire_confirmed_action(
     store.add_confirmed_action(ca)
     # Push SSE from sync context via asyncio — this is called inside an async task
     asyncio.get_event_loop().call_soon(
-        lambda: asyncio.ensure_future(store.push_event(SSEEvent(
+        lambda: asyncio.ensure_future(store.push_event(SSEEvent.model_construct(
             type=SSEEventType.TASK_UPDATED,
             data={
                 "confirmed_action": {
@@ -351,21 +352,8 @@ async def _create_and_run_service_task(
     consult_analysis: dict | None = None,
 ):
     """Create a service provider task from a confirmed action and run the demo simulation."""
-    from routers.demo import (
-        _phase_research,
-        _phase_call,
-        _phase_tool_calls,
-        _phase_resolution,
-        _phase_cancellation_resolution,
-        _generate_call_id,
-        _generate_confirmation,
-        _build_comcast_negotiation_script,
-        _build_cancellation_script,
-    )
-    from services import gmail_service
-
     # Look up rate info from subscription catalog
-    sub = subscription_service.get_subscription_by_service(ca.service)
+    sub = await subscription_service.get_subscription_by_service(ca.service)
     current_rate = (sub["monthly_cost"] if sub else ca.monthly_savings)
     target_rate = current_rate - ca.monthly_savings if ca.action == "negotiate_rate" else 0.0
 
@@ -382,10 +370,10 @@ async def _create_and_run_service_task(
     await store.push_task_update(task)
     await asyncio.sleep(0.5)
 
-    call_id = _generate_call_id()
-    confirmation = _generate_confirmation()
+    call_id = demo_script.generate_call_id()
+    confirmation = demo_script.generate_confirmation()
 
-    research = await _phase_research(task.id, ca.service, ca.action, "subscription")
+    research = await demo_script.phase_research(task.id, ca.service, ca.action, "subscription")
 
     # Inject Velma user-consult insights into the competitor line so the agent
     # sounds informed by what it learned about the user's intent and urgency.
@@ -399,23 +387,23 @@ async def _create_and_run_service_task(
             )
 
     if ca.action == "cancel_service":
-        script = _build_cancellation_script(user_name, ca.service, "membership", confirmation)
+        script = demo_script.build_cancellation_script(user_name, ca.service, "membership", confirmation)
     else:
         base_context = research.get("context", "Competitors offer lower rates in this area.")[:200]
         competitor_line = velma_context_prefix + base_context
-        script = _build_comcast_negotiation_script(
+        script = demo_script.build_comcast_negotiation_script(
             user_name, current_rate, target_rate, competitor_line, confirmation
         )
 
-    await _phase_call(task.id, call_id, script)
-    await _phase_tool_calls(task.id, call_id, ca.service,
+    await demo_script.phase_call(task.id, call_id, script)
+    await demo_script.phase_tool_calls(task.id, call_id, ca.service,
                             research.get("context", ""), confirmation, target_rate)
 
     if ca.action == "cancel_service":
-        await _phase_cancellation_resolution(task.id, call_id, ca.service,
+        await demo_script.phase_cancellation_resolution(task.id, call_id, ca.service,
                                               user_name, current_rate, confirmation)
     else:
-        await _phase_resolution(task.id, call_id, ca.service,
+        await demo_script.phase_resolution(task.id, call_id, ca.service,
                                  current_rate, target_rate, confirmation)
 
     # ── Modulate Velma 2: analyze service provider call ───────
@@ -425,7 +413,7 @@ async def _create_and_run_service_task(
         call_type="service_provider",
         company=ca.service,
     )
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.VOICE_ANALYSIS,
         data={"task_id": task.id, "call_id": call_id, **service_analysis},
     ))
@@ -12,10 +12,14 @@ CRITICAL FORMAT (from Vapi docs):
 - result and error must be single-line strings
 """
 
+import asyncio
 import json
 import logging
+from typing import Awaitable, Callable
 
+import orjson
 from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
 
 from models.schemas import SSEEvent, SSEEventType, ConfirmedAction
 from services.task_store import store
@@ -23,82 +27,98 @@ from services import tavily_service, senso_service, airbyte_service, subscriptio
 from services.neo4j_service import neo4j_service
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(tags=["Vapi Tools"])
+
+# Vapi requires single-line results: newlines become spaces, carriage returns are dropped
+_SANITIZE = str.maketrans({"\n": " ", "\r": None})
 
 
 @router.post("/api/vapi/tool-call")
 async def handle_tool_call(request: Request):
-    body = await request.json()
+    body = orjson.loads(await request.body())
     message = body.get("message", {})
     tool_call_list = message.get("toolCallList", [])
     call_obj = message.get("call", {})
     call_id = call_obj.get("id", "unknown")
 
+    # Tool calls in one message are independent — run them concurrently, keep Vapi's order.
+    # One call failing outside its handler must not take down (or orphan) its siblings.
+    outcomes = await asyncio.gather(
+        *(_run_tool_call(tc, call_id) for tc in tool_call_list), return_exceptions=True
+    )
     results = []
-
-    for tool_call in tool_call_list:
-        tc_id = tool_call.get("id", "")
-        # Vapi nests name/arguments under "function" key
-        func = tool_call.get("function", {})
-        tc_name = func.get("name", "") or tool_call.get("name", "")
-        args = func.get("arguments", {}) or tool_call.get("arguments", {})
-        if isinstance(args, str):
-            try:
-                args = json.loads(args)
-            except json.JSONDecodeError:
-                args = {}
-
-        logger.info("Tool call: %s (id=%s) args=%s", tc_name, tc_id, args)
-
-        # Push tool call badge to dashboard live feed
-        await store.push_event(SSEEvent(
-            type=SSEEventType.TOOL_CALL,
-            data={
-                "call_id": call_id,
-                "tool": tc_name,
-                "arguments": {k: str(v)[:100] for k, v in args.items()},
-            },
-        ))
-
+    for tc, outcome in zip(tool_call_list, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("Tool call failed: %s", outcome)
+            tc_id = tc.get("id", "") if isinstance(tc, dict) else ""
+            outcome = {"toolCallId": tc_id, "result": f"Error: {outcome}".translate(_SANITIZE)}
+        results.append(outcome)
+    return ORJSONResponse({"results": results})
+
+
+async def _run_tool_call(tool_call: dict, call_id: str) -> dict:
+    """Execute a single entry of toolCallList and build its Vapi result object."""
+    tc_id = tool_call.get("id", "")
+    # Vapi nests name/arguments under "function" key
+    func = tool_call.get("function", {})
+    tc_name = func.get("name", "") or tool_call.get("name", "")
+    args = func.get("arguments", {}) or tool_call.get("arguments", {})
+    if isinstance(args, str):
         try:
-            result = await _dispatch_tool(tc_name, args, call_id)
-        except Exception as e:
-            logger.error("Tool %s failed: %s", tc_name, e)
-            result = f"Error: {str(e)}"
-
-        # Ensure single-line string
-        result_str = str(result).replace("\n", " ").replace("\r", "")
-
-        results.append({
-            "name": tc_name,
-            "toolCallId": tc_id,
-            "result": result_str,
-        })
+            args = json.loads(args)
+        except json.JSONDecodeError:
+            args = {}
+    # Handlers and the badge below expect an object; a JSON list or scalar is treated as no args
+    if not isinstance(args, dict):
+        args = {}
+
+    logger.info("Tool call: %s (id=%s) args=%s", tc_name, tc_id, args)
+
+    # Push tool call badge to dashboard live feed
+    await store.push_event(SSEEvent.model_construct(
+        type=SSEEventType.TOOL_CALL,
+        data={
+            "call_id": call_id,
+            "tool": tc_name,
+            "arguments": {k: str(v)[:100] for k, v in args.items()},
+        },
+    ))
 
-    return {"results": results}
+    try:
+        result = await _dispatch_tool(tc_name, args, call_id)
+    except Exception as e:
+        logger.error("Tool %s failed: %s", tc_name, e)
+        result = f"Error: {str(e)}"
+
+    # Ensure single-line string
+    result_str = str(result).translate(_SANITIZE)
+
+    return {
+        "name": tc_name,
+        "toolCallId": tc_id,
+        "result": result_str,
+    }
+
+
+# Tool name → handler, resolved with a single dict lookup per call
+_TOOL_HANDLERS: dict[str, Callable[[dict, str], Awaitable[str]]] = {
+    "search_task_context": lambda args, call_id: _handle_search_task_context(args, call_id),
+    "tavily_search": lambda args, call_id: _handle_tavily_search(args),
+    "extract_entities": lambda args, call_id: _handle_extract_entities(args, call_id),
+    "update_neo4j": lambda args, call_id: _handle_update_neo4j(args, call_id),
+    "end_task": lambda args, call_id: _handle_end_task(args, call_id),
+    "get_subscription_analysis": lambda args, call_id: _handle_get_subscription_analysis(),
+    "confirm_action": lambda args, call_id: _handle_confirm_action(args, call_id),
+    "calculate_cost_per_use": lambda args, call_id: _handle_calculate_cost_per_use(args),
+}
 
 
 async def _dispatch_tool(name: str, args: dict, call_id: str) -> str:
     """Route tool call to the correct handler."""
-
-    if name == "search_task_context":
-        return await _handle_search_task_context(args, call_id)
-    elif name == "tavily_search":
-        return await _handle_tavily_search(args)
-    elif name == "extract_entities":
-        return await _handle_extract_entities(args, call_id)
-    elif name == "update_neo4j":
-        return await _handle_update_neo4j(args, call_id)
-    elif name == "end_task":
-        return await _handle_end_task(args, call_id)
-    elif name == "get_subscription_analysis":
-        return _handle_get_subscription_analysis()
-    elif name == "confirm_action":
-        return await _handle_confirm_action(args, call_id)
-    elif name == "calculate_cost_per_use":
-        return _handle_calculate_cost_per_use(args)
-    else:
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
         return f"Unknown tool: {name}"
+    return await handler(args, call_id)
 
 
 # ── Tool Handlers ────────────────────────────────────────────
@@ -111,17 +131,13 @@ async def _handle_search_task_context(args: dict, call_id: str) -> str:
     # Try to find by exact ID first
     task = store.get_task(task_id)
 
-    # If not found, find the first task that's currently calling
+    # If not found, use the task linked to this call, then the first one currently calling
     if not task:
-        for t in store.list_tasks():
-            if t.call_id == call_id or t.status == "calling":
-                task = t
-                break
+        task = store.get_task_by_call_id(call_id) or store.get_first_calling_task()
 
-    # Last resort: return first pending task
+    # Last resort: return first task
     if not task:
-        tasks = store.list_tasks()
-        task = tasks[0] if tasks else None
+        task = store.get_first_task()
 
     if not task:
         return "No task found. Ask the customer how you can help them."
@@ -153,7 +169,8 @@ async def _handle_tavily_search(args: dict) -> str:
     query = args.get("query", "")
     if not query:
         return "No search query provided."
-    return tavily_service.search(query)
+    # Tavily's SDK is blocking — keep the event loop free for concurrent tool calls
+    return await asyncio.to_thread(tavily_service.search, query)
 
 
 async def _handle_extract_entities(args: dict, call_id: str) -> str:
@@ -166,19 +183,18 @@ async def _handle_extract_entities(args: dict, call_id: str) -> str:
         return "No value provided."
 
     # Store in Neo4j graph
-    neo4j_service.add_entity(entity_type, value, context, call_id)
+    await neo4j_service.add_entity(entity_type, value, context, call_id)
 
     # Update the linked task
-    for task in store.list_tasks():
-        if task.call_id == call_id:
-            if entity_type == "confirmation_number":
-                store.update_task(task.id, confirmation_number=value)
-            elif entity_type == "price":
-                store.update_task(task.id, outcome=f"New rate: {value}")
-            break
+    task = store.get_task_by_call_id(call_id)
+    if task:
+        if entity_type == "confirmation_number":
+            store.update_task(task.id, confirmation_number=value)
+        elif entity_type == "price":
+            store.update_task(task.id, outcome=f"New rate: {value}")
 
     # Push to SSE for dashboard
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.ENTITY_EXTRACTED,
         data={
             "entity_type": entity_type,
@@ -203,25 +219,25 @@ async def _handle_update_neo4j(args: dict, call_id: str) -> str:
         details = {"raw": details_raw}
 
     if action == "cancel_service":
-        result = neo4j_service.cancel_service(
+        result = await neo4j_service.cancel_service(
             user_name="Neel",
             service_name=service_name,
             confirmation=details.get("confirmation", ""),
         )
     elif action == "negotiate_rate":
-        result = neo4j_service.update_service_rate(
+        result = await neo4j_service.update_service_rate(
             service_name=service_name,
             old_rate=float(details.get("old_rate", 0)),
             new_rate=float(details.get("new_rate", 0)),
             confirmation=details.get("confirmation", ""),
         )
     elif action == "update_status":
-        result = neo4j_service.update_status(service_name, str(details))
+        result = await neo4j_service.update_status(service_name, str(details))
     else:
-        result = neo4j_service.update_status(service_name, str(details))
+        result = await neo4j_service.update_status(service_name, str(details))
 
     # Push graph update to SSE
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.GRAPH_UPDATED,
         data={"action": action, "service": service_name, "details": details},
     ))
@@ -235,31 +251,30 @@ async def _handle_end_task(args: dict, call_id: str) -> str:
     summary = args.get("summary", "")
 
     # Find and update the task
-    for task in store.list_tasks():
-        if task.call_id == call_id:
-            new_status = {
-                "completed": "completed",
-                "failed": "failed",
-                "needs_followup": "needs_followup",
-                "transferred": "needs_followup",
-            }.get(status, "completed")
-
-            store.update_task(task.id, status=new_status, outcome=summary)
-            await store.push_task_update(task)
-
-            # Send completion alert to Slack via Airbyte connector
-            savings = task.savings or 0
-            await airbyte_service.send_task_summary(task.company, summary, savings)
-            break
+    task = store.get_task_by_call_id(call_id)
+    if task:
+        new_status = {
+            "completed": "completed",
+            "failed": "failed",
+            "needs_followup": "needs_followup",
+            "transferred": "needs_followup",
+        }.get(status, "completed")
+
+        store.update_task(task.id, status=new_status, outcome=summary)
+        await store.push_task_update(task)
+
+        # Send completion alert to Slack via Airbyte connector
+        savings = task.savings or 0
+        await airbyte_service.send_task_summary(task.company, summary, savings)
 
     return f"Task marked as {status}. {summary}"
 
 
 # ── User Consult Tool Handlers ───────────────────────────────
 
-def _handle_get_subscription_analysis() -> str:
+async def _handle_get_subscription_analysis() -> str:
     """Return the full billing context so the agent can present findings to the user."""
-    ctx = subscription_service.build_subscription_context()
+    ctx = await subscription_service.build_subscription_context()
     subs = ctx["subscriptions"]
     lines = [ctx["summary_text"], "", "DETAILS:"]
     for s in subs:
@@ -288,7 +303,7 @@ async def _handle_confirm_action(args: dict, call_id: str) -> str:
         return "Missing service or action — cannot confirm."
 
     # Look up phone number from subscription catalog
-    sub = subscription_service.get_subscription_by_service(service)
+    sub = await subscription_service.get_subscription_by_service(service)
     phone = sub["phone_number"] if sub else "+18005551234"
 
     confirmed = ConfirmedAction(
@@ -301,7 +316,7 @@ async def _handle_confirm_action(args: dict, call_id: str) -> str:
     store.add_confirmed_action(confirmed)
 
     # Push SSE so dashboard shows confirmed action in real-time
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.TASK_UPDATED,
         data={
             "confirmed_action": {
@@ -319,7 +334,7 @@ async def _handle_confirm_action(args: dict, call_id: str) -> str:
     return f"Confirmed: will {action.replace('_', ' ')} {service}. Saves ${monthly_savings:.0f}/mo. I'll take care of this right after our call."
 
 
-def _handle_calculate_cost_per_use(args: dict) -> str:
+async def _handle_calculate_cost_per_use(args: dict) -> str:
     """Calculate cost-per-visit and compare against alternatives."""
     service = args.get("service", "service")
     monthly_cost = float(args.get("monthly_cost", 0))
@@ -331,7 +346,7 @@ def _handle_calculate_cost_per_use(args: dict) -> str:
     cost_per_visit = monthly_cost / visits
 
     # Look up day-pass cost if known
-    sub = subscription_service.get_subscription_by_service(service)
+    sub = await subscription_service.get_subscription_by_service(service)
     day_pass = sub.get("day_pass_cost") if sub else None
 
     result = f"{service}: ${monthly_cost:.0f}/mo ÷ {visits:.0f} visits = ${cost_per_visit:.2f}/visit."
@@ -15,21 +15,24 @@ From Vapi docs: Always return HTTP 200, even for errors.
 import asyncio
 import logging
 
-from fastapi import APIRouter, Request
+import orjson
+from fastapi import APIRouter, Request, Response
 
 from models.schemas import SSEEvent, SSEEventType, TaskCreate, TaskAction, TaskStatus
-from services.task_store import store
-from services import gmail_service, modulate_service, fastino_service, postgres_service
+from services.task_store import store, encode_sse
+from services import gmail_service, modulate_service, fastino_service, postgres_service, background, demo_script
 import config
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(tags=["Vapi Webhooks"])
 
+# Pre-encoded acknowledgement — the webhook fires per transcript chunk
+_OK_BODY = b'{"status":"ok"}'
 
 
 @router.post("/api/vapi/webhook")
 async def vapi_webhook(request: Request):
-    body = await request.json()
+    body = orjson.loads(await request.body())
     message = body.get("message", {})
     msg_type = message.get("type", "")
     call_obj = message.get("call", {})
@@ -52,7 +55,7 @@ async def vapi_webhook(request: Request):
         pass
 
     # Always return 200
-    return {"status": "ok"}
+    return Response(_OK_BODY, media_type="application/json")
 
 
 async def _handle_end_of_call(message: dict, call_id: str):
@@ -65,26 +68,18 @@ async def _handle_end_of_call(message: dict, call_id: str):
     structured_data = analysis.get("structuredData", {})
     duration = message.get("durationSeconds", 0)
 
-    logger.info(
-        "Call ended: reason=%s summary=%s",
-        ended_reason,
-        summary[:100] if summary else "none",
-    )
+    logger.info("Call ended: reason=%s summary=%.100s", ended_reason, summary or "none")
 
     # ── Branch: user consult call ────────────────────────────
     # Detect by finding a consult_user task linked to this call_id
-    consult_task = None
-    for task in store.list_tasks():
-        if task.call_id == call_id and task.action == TaskAction.CONSULT_USER:
-            consult_task = task
-            break
+    task = store.get_task_by_call_id(call_id)
 
-    if consult_task:
+    if task and task.action == TaskAction.CONSULT_USER:
         # Run Modulate Velma 2 on the user consult call, then dispatch service tasks
         await _run_modulate_user_consult(call_id, message)
-        await _handle_consult_end_of_call(consult_task, call_id)
+        await _handle_consult_end_of_call(task, call_id)
         # Push SSE and return — skip service-provider logic below
-        await store.push_event(SSEEvent(
+        await store.push_event(SSEEvent.model_construct(
             type=SSEEventType.CALL_STATUS,
             data={"call_id": call_id, "status": "ended", "ended_reason": ended_reason,
                   "call_type": "user_consult"},
@@ -92,44 +87,41 @@ async def _handle_end_of_call(message: dict, call_id: str):
         return
 
     # ── Branch: service provider call (existing logic) ───────
-    for task in store.list_tasks():
-        if task.call_id == call_id:
-            task_completed = structured_data.get("task_completed", False)
-            outcome = structured_data.get("outcome", summary or "Call ended")
-            savings = structured_data.get("savings_amount", 0)
-            conf = structured_data.get("confirmation_number", "")
-
-            new_status = "completed" if task_completed else "needs_followup"
-
-            store.update_task(
-                task.id,
-                status=new_status,
-                outcome=outcome,
-                savings=savings,
-                confirmation_number=conf or task.confirmation_number,
-            )
-            await store.push_task_update(task)
+    if task:
+        task_completed = structured_data.get("task_completed", False)
+        outcome = structured_data.get("outcome", summary or "Call ended")
+        # structuredData comes from the model; the amount may arrive as a string ("25.50") or junk
+        try:
+            savings = float(structured_data.get("savings_amount") or 0)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring non-numeric savings_amount: %r", structured_data.get("savings_amount"))
+            savings = 0.0
+        conf = structured_data.get("confirmation_number", "")
+
+        new_status = "completed" if task_completed else "needs_followup"
+
+        store.update_task(
+            task.id,
+            status=new_status,
+            outcome=outcome,
+            savings=savings,
+            confirmation_number=conf or task.confirmation_number,
+        )
+        await store.push_task_update(task)
 
-            # Send call summary email with full transcript
-            refreshed = store.get_task(task.id)
-            await gmail_service.send_call_summary(
-                task=refreshed,
-                transcript_text=transcript,
-            )
-            break
+        # Send call summary email with full transcript
+        await gmail_service.send_call_summary(
+            task=task,
+            transcript_text=transcript,
+        )
 
     # ── Postgres: durable call log ──────────────────────────────
     try:
-        task_for_log = None
-        for t in store.list_tasks():
-            if t.call_id == call_id:
-                task_for_log = t
-                break
         await postgres_service.insert_call_log(
             call_id=call_id,
-            task_id=task_for_log.id if task_for_log else "",
-            company=task_for_log.company if task_for_log else "",
-            action=task_for_log.action.value if task_for_log else "",
+            task_id=task.id if task else "",
+            company=task.company if task else "",
+            action=task.action.value if task else "",
             outcome=structured_data.get("outcome", summary or ""),
             savings=structured_data.get("savings_amount", 0),
             confirmation=structured_data.get("confirmation_number", ""),
@@ -140,7 +132,7 @@ async def _handle_end_of_call(message: dict, call_id: str):
         logger.error("Postgres call log failed: %s", e)
 
     # Push full report to SSE
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.CALL_STATUS,
         data={
             "call_id": call_id,
@@ -165,7 +157,7 @@ async def _handle_end_of_call(message: dict, call_id: str):
                 # Build agent performance report from Modulate data
                 perf = _build_agent_performance(safety_report, summary, duration)
 
-                await store.push_event(SSEEvent(
+                await store.push_event(SSEEvent.model_construct(
                     type=SSEEventType.MODULATE_ANALYSIS,
                     data={
                         "call_id": call_id,
@@ -177,7 +169,7 @@ async def _handle_end_of_call(message: dict, call_id: str):
                 ))
 
                 if safety_report.get("pii_detected", 0) > 0:
-                    await store.push_event(SSEEvent(
+                    await store.push_event(SSEEvent.model_construct(
                         type=SSEEventType.PII_DETECTED,
                         data={
                             "call_id": call_id,
@@ -200,18 +192,16 @@ async def _handle_end_of_call(message: dict, call_id: str):
         try:
             negotiation = fastino_service.extract_negotiation_result(transcript)
             if negotiation and negotiation.get("outcome"):
-                for t in store.list_tasks():
-                    if t.call_id == call_id:
-                        updates = {}
-                        if negotiation.get("confirmation"):
-                            updates["confirmation_number"] = negotiation["confirmation"]
-                        if negotiation.get("outcome"):
-                            updates["outcome"] = f"GLiNER2: {negotiation['outcome']}"
-                        if negotiation.get("new_rate"):
-                            updates["outcome"] = f"GLiNER2: {negotiation['outcome']} — new rate {negotiation['new_rate']}"
-                        if updates:
-                            store.update_task(t.id, **updates)
-                        break
+                if task:
+                    updates = {}
+                    if negotiation.get("confirmation"):
+                        updates["confirmation_number"] = negotiation["confirmation"]
+                    if negotiation.get("outcome"):
+                        updates["outcome"] = f"GLiNER2: {negotiation['outcome']}"
+                    if negotiation.get("new_rate"):
+                        updates["outcome"] = f"GLiNER2: {negotiation['outcome']} — new rate {negotiation['new_rate']}"
+                    if updates:
+                        store.update_task(task.id, **updates)
                 logger.info("GLiNER2 post-call extraction: %s", negotiation)
         except Exception as e:
             logger.error("GLiNER2 post-call extraction failed: %s", e)
@@ -238,7 +228,7 @@ async def _run_modulate_user_consult(call_id: str, message: dict):
         logger.warning("Modulate user consult analysis failed, using demo fallback: %s", exc)
         analysis = modulate_service._analyze_user_consult_demo(transcript)
 
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.VOICE_ANALYSIS,
         data={**analysis, "call_id": call_id},
     ))
@@ -257,13 +247,13 @@ async def _handle_consult_end_of_call(consult_task, call_id: str):
     store.clear_confirmed_actions()
 
     # Mark the consult task complete
-    store.update_task(consult_task.id, status=TaskStatus.COMPLETED,
-                      outcome=f"User confirmed {len(confirmed)} action(s)")
-    await store.push_task_update(store.get_task(consult_task.id))
+    completed = store.update_task(consult_task.id, status=TaskStatus.COMPLETED,
+                                  outcome=f"User confirmed {len(confirmed)} action(s)")
+    await store.push_task_update(completed)
 
     if not confirmed:
         logger.info("User consult ended with no confirmed actions.")
-        await store.push_event(SSEEvent(
+        await store.push_event(SSEEvent.model_construct(
             type=SSEEventType.TASK_UPDATED,
             data={"message": "Consult complete — no actions confirmed by user.", "call_id": call_id},
         ))
@@ -271,7 +261,7 @@ async def _handle_consult_end_of_call(consult_task, call_id: str):
 
     logger.info("User consult confirmed %d action(s) — creating service tasks", len(confirmed))
 
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.TASK_UPDATED,
         data={
             "message": f"User confirmed {len(confirmed)} action(s). Dispatching service calls now...",
@@ -295,36 +285,28 @@ async def _handle_consult_end_of_call(consult_task, call_id: str):
         await store.push_task_update(new_task)
 
         # Schedule the demo simulation for this task (non-blocking)
-        asyncio.create_task(_auto_run_service_task(new_task.id))
+        background.spawn_demo_task(_auto_run_service_task(new_task.id))
 
 
 async def _auto_run_service_task(task_id: str):
     """Run the full demo simulation for a service provider task created post-consult."""
-    from routers.demo import (
-        _phase_research, _phase_call, _phase_tool_calls,
-        _phase_resolution, _phase_cancellation_resolution,
-        _generate_call_id, _generate_confirmation,
-        _build_comcast_negotiation_script, _build_cancellation_script,
-    )
-    import asyncio as _asyncio
-
-    await _asyncio.sleep(1.5)  # brief pause so dashboard shows the task first
+    await asyncio.sleep(1.5)  # brief pause so dashboard shows the task first
 
     task = store.get_task(task_id)
     if not task:
         return
 
-    call_id = _generate_call_id()
-    confirmation = _generate_confirmation()
+    call_id = demo_script.generate_call_id()
+    confirmation = demo_script.generate_confirmation()
 
-    research = await _phase_research(task_id, task.company, task.action.value, task.service_type or "")
+    research = await demo_script.phase_research(task_id, task.company, task.action.value, task.service_type or "")
 
     if task.action.value == "cancel_service":
-        script = _build_cancellation_script(task.user_name, task.company,
+        script = demo_script.build_cancellation_script(task.user_name, task.company,
                                              task.service_type or "service", confirmation)
     else:
         ctx = research.get("context", "Competitors offer lower rates in this area.")
-        script = _build_comcast_negotiation_script(
+        script = demo_script.build_comcast_negotiation_script(
             task.user_name,
             task.current_rate or 85.0,
             task.target_rate or 65.0,
@@ -332,16 +314,16 @@ async def _auto_run_service_task(task_id: str):
             confirmation,
         )
 
-    await _phase_call(task_id, call_id, script)
-    await _phase_tool_calls(task_id, call_id, task.company,
+    await demo_script.phase_call(task_id, call_id, script)
+    await demo_script.phase_tool_calls(task_id, call_id, task.company,
                              research.get("context", ""), confirmation,
                              task.target_rate or 65.0)
 
     if task.action.value == "cancel_service":
-        await _phase_cancellation_resolution(task_id, call_id, task.company,
+        await demo_script.phase_cancellation_resolution(task_id, call_id, task.company,
                                               task.user_name, task.current_rate or 25.0, confirmation)
     else:
-        await _phase_resolution(task_id, call_id, task.company,
+        await demo_script.phase_resolution(task_id, call_id, task.company,
                                  task.current_rate or 85.0, task.target_rate or 65.0, confirmation)
 
     # Send Gmail summary for this completed task
@@ -440,13 +422,12 @@ async def _handle_status_update(message: dict, call_id: str):
 
     # Update task status based on call state
     if status == "in-progress":
-        for task in store.list_tasks():
-            if task.call_id == call_id:
-                store.update_task(task.id, status="calling")
-                await store.push_task_update(task)
-                break
+        task = store.get_task_by_call_id(call_id)
+        if task:
+            store.update_task(task.id, status="calling")
+            await store.push_task_update(task)
 
-    await store.push_event(SSEEvent(
+    await store.push_event(SSEEvent.model_construct(
         type=SSEEventType.CALL_STATUS,
         data={"call_id": call_id, "status": status},
     ))
@@ -469,11 +450,9 @@ async def _handle_transcript(message: dict, call_id: str):
     # Normalize role for dashboard
     display_role = "agent" if role in ("assistant", "bot") else "rep"
 
-    await store.push_event(SSEEvent(
-        type=SSEEventType.TRANSCRIPT,
-        data={
-            "call_id": call_id,
-            "role": display_role,
-            "text": transcript_text,
-        },
-    ))
+    # Highest-volume event — encode the frame directly instead of going through SSEEvent
+    await store.push_sse_bytes(encode_sse(SSEEventType.TRANSCRIPT, {
+        "call_id": call_id,
+        "role": display_role,
+        "text": transcript_text,
+    }))
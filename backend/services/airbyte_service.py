@@ -11,43 +11,81 @@ the agent connector packages may not be available on all Python versions.
 Same entity-action pattern, just implemented with raw HTTP.
 """
 
+import itertools
 import logging
 import time
 from typing import Optional
 
 import httpx
 
-import config
+from config import STRIPE_API_KEY, SLACK_BOT_TOKEN, SLACK_CHANNEL_ID
 
 logger = logging.getLogger(__name__)
 
+# Long-lived clients (lazy) — reuse pooled connections instead of a TLS handshake per call
+_stripe_client: Optional[httpx.AsyncClient] = None
+_slack_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_stripe_client() -> httpx.AsyncClient:
+    global _stripe_client
+    if _stripe_client is None:
+        _stripe_client = httpx.AsyncClient(
+            base_url="https://api.stripe.com",
+            timeout=15.0,
+            headers={"Authorization": f"Bearer {STRIPE_API_KEY}"},
+        )
+    return _stripe_client
+
+
+def _get_slack_client() -> httpx.AsyncClient:
+    global _slack_client
+    if _slack_client is None:
+        _slack_client = httpx.AsyncClient(
+            base_url="https://slack.com",
+            timeout=10.0,
+            headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
+        )
+    return _slack_client
+
+
+async def close():
+    """Close the shared HTTP clients (called from app shutdown)."""
+    global _stripe_client, _slack_client
+    for client in (_stripe_client, _slack_client):
+        if client is not None:
+            await client.aclose()
+    _stripe_client = _slack_client = None
+
 
 # ── Stripe: Detect Billing Anomalies ─────────────────────────
 
 async def check_stripe_charges(days: int = 30) -> list[dict]:
     """Pull recent Stripe charges and detect anomalies."""
-    if not config.STRIPE_API_KEY:
+    if not STRIPE_API_KEY:
         logger.debug("STRIPE_API_KEY not set — Stripe monitoring disabled")
         return []
 
     created_after = int(time.time()) - (days * 86400)
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                "https://api.stripe.com/v1/charges",
-                params={"limit": 50, "created[gte]": created_after},
-                headers={"Authorization": f"Bearer {config.STRIPE_API_KEY}"},
-            )
-            resp.raise_for_status()
-            charges = resp.json().get("data", [])
-            logger.info("Fetched %d Stripe charges from last %d days", len(charges), days)
-            return charges
+        resp = await _get_stripe_client().get(
+            "/v1/charges",
+            params={"limit": 50, "created[gte]": created_after},
+        )
+        resp.raise_for_status()
+        charges = resp.json().get("data", [])
+        logger.info("Fetched %d Stripe charges from last %d days", len(charges), days)
+        return charges
     except Exception as e:
         logger.error("Stripe charge fetch failed: %s", e)
         return []
 
 
+def _merchant_of(charge: dict) -> str:
+    return charge.get("description", "") or charge.get("statement_descriptor", "") or "unknown"
+
+
 async def detect_billing_anomalies(days: int = 60) -> list[dict]:
     """Analyze Stripe charges for anomalies: rate hikes, duplicates, new fees."""
     charges = await check_stripe_charges(days)
@@ -56,44 +94,48 @@ async def detect_billing_anomalies(days: int = 60) -> list[dict]:
 
     anomalies = []
 
-    # Group by description/merchant
-    by_merchant: dict[str, list[dict]] = {}
-    for charge in charges:
-        desc = charge.get("description", "") or charge.get("statement_descriptor", "") or "unknown"
-        by_merchant.setdefault(desc, []).append(charge)
+    # One sort by (merchant, created) — each merchant group comes out already in date order
+    charges.sort(key=lambda c: (_merchant_of(c), c["created"]))
 
-    for merchant, merchant_charges in by_merchant.items():
-        if len(merchant_charges) < 2:
+    now = time.time()
+    for merchant, group in itertools.groupby(charges, key=_merchant_of):
+        sorted_charges = list(group)
+        if len(sorted_charges) < 2:
             continue
 
-        # Sort by creation date
-        sorted_charges = sorted(merchant_charges, key=lambda c: c["created"])
-        amounts = [c["amount"] / 100.0 for c in sorted_charges]  # cents to dollars
+        # Single pass for duplicate charges (same amount within 48 hours of the previous one)
+        duplicate = None
+        prev = None
+        for charge in sorted_charges:
+            if (
+                prev is not None
+                and charge["amount"] == prev["amount"]
+                and charge["created"] - prev["created"] < 172800
+            ):
+                duplicate = prev
+                break
+            prev = charge
 
         # Detect rate increase (latest charge > previous by 10%+)
-        if len(amounts) >= 2 and amounts[-1] > amounts[-2] * 1.10:
+        old_amount = sorted_charges[-2]["amount"] / 100.0  # cents to dollars
+        new_amount = sorted_charges[-1]["amount"] / 100.0
+        if new_amount > old_amount * 1.10:
             anomalies.append({
                 "type": "BILLING_INCREASE",
                 "merchant": merchant,
-                "old_amount": amounts[-2],
-                "new_amount": amounts[-1],
-                "increase_pct": round((amounts[-1] - amounts[-2]) / amounts[-2] * 100, 1),
-                "detected_at": time.time(),
+                "old_amount": old_amount,
+                "new_amount": new_amount,
+                "increase_pct": round((new_amount - old_amount) / old_amount * 100, 1),
+                "detected_at": now,
             })
 
-        # Detect duplicate charges (same amount within 48 hours)
-        for i in range(len(sorted_charges) - 1):
-            if (
-                sorted_charges[i + 1]["created"] - sorted_charges[i]["created"] < 172800
-                and sorted_charges[i]["amount"] == sorted_charges[i + 1]["amount"]
-            ):
-                anomalies.append({
-                    "type": "DUPLICATE_CHARGE",
-                    "merchant": merchant,
-                    "amount": sorted_charges[i]["amount"] / 100.0,
-                    "detected_at": time.time(),
-                })
-                break
+        if duplicate is not None:
+            anomalies.append({
+                "type": "DUPLICATE_CHARGE",
+                "merchant": merchant,
+                "amount": duplicate["amount"] / 100.0,
+                "detected_at": now,
+            })
 
     logger.info("Detected %d billing anomalies", len(anomalies))
     return anomalies
@@ -103,26 +145,24 @@ async def detect_billing_anomalies(days: int = 60) -> list[dict]:
 
 async def send_slack_alert(message: str, channel: Optional[str] = None) -> dict:
     """Send a threat alert or call summary to Slack."""
-    token = config.SLACK_BOT_TOKEN
-    ch = channel or config.SLACK_CHANNEL_ID
+    token = SLACK_BOT_TOKEN
+    ch = channel or SLACK_CHANNEL_ID
 
     if not token or not ch:
         logger.debug("Slack not configured — alert skipped")
         return {"status": "slack_unavailable"}
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                "https://slack.com/api/chat.postMessage",
-                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-                json={"channel": ch, "text": message},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            if not data.get("ok"):
-                logger.error("Slack API error: %s", data.get("error"))
-                return {"error": data.get("error")}
-            return {"status": "sent", "ts": data.get("ts")}
+        resp = await _get_slack_client().post(
+            "/api/chat.postMessage",
+            json={"channel": ch, "text": message},
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        if not data.get("ok"):
+            logger.error("Slack API error: %s", data.get("error"))
+            return {"error": data.get("error")}
+        return {"status": "sent", "ts": data.get("ts")}
     except Exception as e:
         logger.error("Slack alert failed: %s", e)
         return {"error": str(e)}
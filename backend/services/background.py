@@ -0,0 +1,30 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Holding the tasks keeps fire-and-forget demo runs from being garbage-collected
+# mid-flight and lets a demo reset cancel whatever is still playing.
+demo_runs: set[asyncio.Task] = set()
+
+
+def spawn_demo_task(coro) -> asyncio.Task:
+    """Run a demo simulation in the background; failures are logged, cancel_demo_runs() stops it."""
+    task = asyncio.create_task(coro)
+    demo_runs.add(task)
+    task.add_done_callback(_demo_run_done)
+    return task
+
+
+def _demo_run_done(task: asyncio.Task):
+    demo_runs.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Demo run failed", exc_info=task.exception())
+
+
+async def cancel_demo_runs():
+    """Cancel every in-flight demo run and wait for them to unwind."""
+    runs = list(demo_runs)
+    for task in runs:
+        task.cancel()
+    await asyncio.gather(*runs, return_exceptions=True)
@@ -0,0 +1,52 @@
+"""
+Retry helper for outbound HTTP calls on the shared httpx clients.
+
+Only transient failures are retried — transport errors and 5xx responses —
+with exponential backoff plus jitter. Anything else (4xx, bad JSON) is
+returned/raised on the first attempt so callers' error handling is unchanged.
+"""
+
+import asyncio
+import logging
+import random
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Failures where the request never reached the server — safe to resend even for non-idempotent calls
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+async def request(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    attempts: int = 3,
+    idempotent: bool = True,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a request, retrying transient failures.
+
+    idempotent=False (e.g. placing a phone call) only retries errors raised
+    before the request was sent, and never retries on a 5xx response.
+    The final response is returned as-is; the final exception is re-raised.
+    """
+    retry_on = httpx.TransportError if idempotent else _NOT_SENT
+    for attempt in range(1, attempts):
+        try:
+            resp = await client.request(method, url, **kwargs)
+        except retry_on as e:
+            logger.warning("%s %s failed (%s), retrying (%d/%d)", method, url, e, attempt, attempts - 1)
+        else:
+            if not (idempotent and resp.is_server_error):
+                return resp
+            logger.warning("%s %s returned %d, retrying (%d/%d)", method, url, resp.status_code, attempt, attempts - 1)
+        delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+        await asyncio.sleep(delay + random.uniform(0, delay))
+    # Last attempt: whatever happens is the caller's to handle
+    return await client.request(method, url, **kwargs)
@@ -1,36 +1,172 @@
 import logging
 from typing import Optional
 
-from neo4j import GraphDatabase
-from neo4j.exceptions import Neo4jError, ServiceUnavailable
-
 import config
 
 logger = logging.getLogger(__name__)
 
+# Demo scenario rows — seeded in one UNWIND statement
+_DEMO_SERVICES = [
+    {"name": "Comcast", "type": "internet", "monthlyRate": 85, "since": "2023-01-15"},
+    {"name": "Planet Fitness", "type": "gym", "monthlyRate": 25, "since": "2022-06-01"},
+]
+
+# ── Cypher ───────────────────────────────────────────────────
+# Stable module-level query strings: built once, identical text every call
+
+# Unique constraints double as the name indexes every MATCH (:Label {name: $x}) seeks on
+CYPHER_CONSTRAINTS = (
+    "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.name IS UNIQUE",
+    "CREATE CONSTRAINT service_name IF NOT EXISTS FOR (s:Service) REQUIRE s.name IS UNIQUE",
+)
+
+CYPHER_SEED_DEMO = (
+    "MERGE (user:Person {name: $user}) "
+    "WITH user "
+    "UNWIND $services AS svc "
+    "MERGE (s:Service {name: svc.name}) "
+    "ON CREATE SET s.type = svc.type, s.monthlyRate = svc.monthlyRate "
+    "MERGE (user)-[r:SUBSCRIBES_TO]->(s) "
+    "ON CREATE SET r.since = svc.since, r.status = 'active'"
+)
+
+# Deletes in batches so a large graph never builds one huge transaction.
+# CALL { } IN TRANSACTIONS only runs in an auto-commit transaction (session.run, not execute_write).
+CYPHER_CLEAR_GRAPH = (
+    "MATCH (n) "
+    "CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+)
+
+CYPHER_UPDATE_RATE = (
+    "MATCH (s:Service {name: $name}) "
+    "SET s.monthlyRate = $new_rate, s.previousRate = $old_rate "
+    "MERGE (n:Negotiation {confirmation: $conf}) "
+    "SET n.date = datetime(), n.oldRate = $old_rate, "
+    "    n.newRate = $new_rate, n.savings = $old_rate - $new_rate "
+    "MERGE (s)<-[:NEGOTIATED]-(n) "
+    "RETURN s.name AS service, n.savings AS savings"
+)
+
+# Both endpoints are seeked by their unique name, then joined with Expand(Into)
+CYPHER_CANCEL_SERVICE = (
+    "MATCH (p:Person {name: $user}) "
+    "MATCH (s:Service {name: $service}) "
+    "MATCH (p)-[r:SUBSCRIBES_TO]->(s) "
+    "SET r.status = 'cancelled', r.cancelledAt = datetime(), "
+    "    r.confirmation = $conf "
+    "RETURN p.name AS person, s.name AS service"
+)
+
+CYPHER_GRAPH_DATA = (
+    "MATCH (n) WHERE n:Person OR n:Service OR n:Negotiation "
+    "OPTIONAL MATCH (n)-[r]->(m) WHERE m:Person OR m:Service OR m:Negotiation "
+    "RETURN n, labels(n) AS labels, r, type(r) AS rel_type, "
+    "       m, labels(m) AS m_labels"
+)
+
+# Same node/edge set as CYPHER_GRAPH_DATA, counted server-side
+CYPHER_GRAPH_COUNTS = (
+    "MATCH (n) WHERE n:Person OR n:Service OR n:Negotiation "
+    "RETURN count(n) AS nodes, "
+    "       sum(COUNT { (n)-[]->(m) WHERE m:Person OR m:Service OR m:Negotiation }) AS relationships"
+)
+
+CYPHER_SUBSCRIPTION_PROFILE = (
+    "MATCH (p:Person {name: $user})-[r:SUBSCRIBES_TO]->(s:Service) "
+    "WHERE r.status = 'active' "
+    "RETURN s.name AS service, s.type AS service_type, "
+    "       s.monthlyRate AS monthly_cost, s.previousRate AS previous_cost, "
+    "       r.since AS since"
+)
+
+CYPHER_UPDATE_STATUS = (
+    "MATCH (s:Service {name: $name}) "
+    "SET s.lastUpdate = datetime(), s.details = $details"
+)
+
+
+# Transaction functions shared by every write (no per-call closures)
+async def _run(tx, query: str, **params):
+    # Write-only: fetch just the summary, no records
+    result = await tx.run(query, **params)
+    await result.consume()
+
+
+async def _run_single(tx, query: str, **params):
+    # At most one small row: take it without the multiple-records warning, then free the buffer
+    result = await tx.run(query, **params)
+    record = await result.single(strict=False)
+    await result.consume()
+    return record
+
+
+def _graph_node(node, labels: list) -> dict:
+    props = dict(node)
+    label = labels[0] if labels else "Node"
+    return {
+        "id": str(node.element_id),
+        "label": label,
+        "name": props.get("name") or props.get("value") or label,
+        "properties": {k: str(v) for k, v in props.items()},
+    }
+
+
+async def _collect_graph(result) -> dict:
+    """Fold CYPHER_GRAPH_DATA rows into the dashboard's {nodes, links} shape."""
+    nodes = {}
+    links = []
+    async for record in result:
+        n_id = str(record["n"].element_id)
+        if n_id not in nodes:
+            nodes[n_id] = _graph_node(record["n"], record["labels"])
+        if record["m"] is not None:
+            m_id = str(record["m"].element_id)
+            if m_id not in nodes:
+                nodes[m_id] = _graph_node(record["m"], record["m_labels"])
+            if record["r"] is not None:
+                links.append({
+                    "source": n_id,
+                    "target": m_id,
+                    "type": record["rel_type"],
+                    "properties": {k: str(v) for k, v in dict(record["r"]).items()},
+                })
+    return {"nodes": list(nodes.values()), "links": links}
+
+
 
 class Neo4jService:
     def __init__(self):
         self.driver = None
 
-    def connect(self):
+    async def connect(self):
         if not config.NEO4J_URI:
             logger.warning("NEO4J_URI not set — graph features disabled")
             return
+        # Imported here so the driver package only loads when a graph is configured
+        from neo4j import AsyncGraphDatabase
+        from neo4j.exceptions import Neo4jError, ServiceUnavailable
+
         try:
-            self.driver = GraphDatabase.driver(
+            self.driver = AsyncGraphDatabase.driver(
                 config.NEO4J_URI,
                 auth=(config.NEO4J_USER, config.NEO4J_PASSWORD),
+                # One shared driver for the process; sessions borrow pooled connections
+                max_connection_pool_size=config.NEO4J_POOL_SIZE,
+                connection_acquisition_timeout=config.NEO4J_ACQ_TIMEOUT,
+                max_connection_lifetime=config.NEO4J_MAX_LIFETIME,
+                # Ping connections idle >30s before reuse instead of failing on a reset socket
+                liveness_check_timeout=30,
+                keep_alive=True,
             )
-            self.driver.verify_connectivity()
+            await self.driver.verify_connectivity()
             logger.info("Connected to Neo4j")
         except (Neo4jError, ServiceUnavailable, Exception) as e:
             logger.error("Neo4j connection failed: %s", e)
             self.driver = None
 
-    def close(self):
+    async def close(self):
         if self.driver:
-            self.driver.close()
+            await self.driver.close()
 
     @property
     def available(self) -> bool:
@@ -38,121 +174,96 @@ class Neo4jService:
 
     # ── Graph Operations ─────────────────────────────────────
 
-    def seed_demo_data(self):
+    async def ensure_constraints(self):
+        """Create the Person/Service name constraints (idempotent) so lookups use index seeks."""
+        if not self.available:
+            return
+        async with self.driver.session() as session:
+            for query in CYPHER_CONSTRAINTS:
+                try:
+                    result = await session.run(query)
+                    await result.consume()
+                except Exception as e:
+                    # e.g. pre-existing duplicate names — queries still work, just without the index
+                    logger.warning("Neo4j constraint not created (%s): %s", query, e)
+
+    async def seed_demo_data(self):
         """Pre-populate graph with demo scenario."""
         if not self.available:
             return
-        with self.driver.session() as session:
-            session.execute_write(lambda tx: tx.run("""
-                MERGE (user:Person {name: 'Neel'})
-                MERGE (comcast:Service {name: 'Comcast', type: 'internet', monthlyRate: 85})
-                MERGE (planet:Service {name: 'Planet Fitness', type: 'gym', monthlyRate: 25})
-                MERGE (user)-[:SUBSCRIBES_TO {since: '2023-01-15', status: 'active'}]->(comcast)
-                MERGE (user)-[:SUBSCRIBES_TO {since: '2022-06-01', status: 'active'}]->(planet)
-            """))
+        async with self.driver.session() as session:
+            await session.execute_write(_run, CYPHER_SEED_DEMO, user="Neel", services=_DEMO_SERVICES)
             logger.info("Demo data seeded")
 
-    def update_service_rate(
+    async def clear_graph(self):
+        """Delete every node and relationship (demo reset)."""
+        if not self.available:
+            return
+        async with self.driver.session() as session:
+            result = await session.run(CYPHER_CLEAR_GRAPH)
+            await result.consume()
+
+    async def update_service_rate(
         self, service_name: str, old_rate: float, new_rate: float, confirmation: str
     ) -> dict:
         if not self.available:
             return {"status": "neo4j_unavailable"}
-        with self.driver.session() as session:
-            result = session.execute_write(
-                lambda tx: tx.run(
-                    "MATCH (s:Service {name: $name}) "
-                    "SET s.monthlyRate = $new_rate, s.previousRate = $old_rate "
-                    "MERGE (n:Negotiation {confirmation: $conf}) "
-                    "SET n.date = datetime(), n.oldRate = $old_rate, "
-                    "    n.newRate = $new_rate, n.savings = $old_rate - $new_rate "
-                    "MERGE (s)<-[:NEGOTIATED]-(n) "
-                    "RETURN s.name AS service, n.savings AS savings",
-                    name=service_name,
-                    old_rate=old_rate,
-                    new_rate=new_rate,
-                    conf=confirmation,
-                ).single()
+        async with self.driver.session() as session:
+            result = await session.execute_write(
+                _run_single,
+                CYPHER_UPDATE_RATE,
+                name=service_name,
+                old_rate=old_rate,
+                new_rate=new_rate,
+                conf=confirmation,
             )
             if result:
                 return {"service": result["service"], "savings": result["savings"]}
             return {"status": "not_found"}
 
-    def cancel_service(
+    async def cancel_service(
         self, user_name: str, service_name: str, confirmation: str
     ) -> dict:
         if not self.available:
             return {"status": "neo4j_unavailable"}
-        with self.driver.session() as session:
-            result = session.execute_write(
-                lambda tx: tx.run(
-                    "MATCH (p:Person {name: $user})-[r:SUBSCRIBES_TO]->(s:Service {name: $service}) "
-                    "SET r.status = 'cancelled', r.cancelledAt = datetime(), "
-                    "    r.confirmation = $conf "
-                    "RETURN p.name AS person, s.name AS service",
-                    user=user_name,
-                    service=service_name,
-                    conf=confirmation,
-                ).single()
+        async with self.driver.session() as session:
+            result = await session.execute_write(
+                _run_single,
+                CYPHER_CANCEL_SERVICE,
+                user=user_name,
+                service=service_name,
+                conf=confirmation,
             )
             if result:
                 return {"person": result["person"], "service": result["service"]}
             return {"status": "not_found"}
 
-    def add_entity(
+    async def add_entity(
         self, entity_type: str, value: str, context: str, call_id: Optional[str] = None
     ) -> dict:
         """No-op: Entity nodes removed to keep graph clean. Data lives on Task objects."""
         return {"entity": value, "type": entity_type, "note": "stored on task only"}
 
-    def get_graph_data(self) -> dict:
+    async def get_graph_data(self) -> dict:
         """Return only meaningful nodes (Person, Service, Negotiation) for visualization."""
         if not self.available:
             return {"nodes": [], "links": []}
-        with self.driver.session() as session:
+        async with self.driver.session() as session:
             # Only fetch Person, Service, Negotiation — skip Entity noise
-            result = session.run(
-                "MATCH (n) WHERE n:Person OR n:Service OR n:Negotiation "
-                "OPTIONAL MATCH (n)-[r]->(m) WHERE m:Person OR m:Service OR m:Negotiation "
-                "RETURN n, labels(n) AS labels, r, type(r) AS rel_type, "
-                "       m, labels(m) AS m_labels"
-            )
-            nodes = {}
-            links = []
-            for record in result:
-                n = record["n"]
-                n_id = str(n.element_id)
-                if n_id not in nodes:
-                    props = dict(n)
-                    label = record["labels"][0] if record["labels"] else "Node"
-                    nodes[n_id] = {
-                        "id": n_id,
-                        "label": label,
-                        "name": props.get("name") or props.get("value") or label,
-                        "properties": {k: str(v) for k, v in props.items()},
-                    }
-                if record["m"] is not None:
-                    m = record["m"]
-                    m_id = str(m.element_id)
-                    if m_id not in nodes:
-                        m_props = dict(m)
-                        m_label = record["m_labels"][0] if record["m_labels"] else "Node"
-                        nodes[m_id] = {
-                            "id": m_id,
-                            "label": m_label,
-                            "name": m_props.get("name") or m_props.get("value") or m_label,
-                            "properties": {k: str(v) for k, v in m_props.items()},
-                        }
-                    if record["r"] is not None:
-                        r_props = dict(record["r"])
-                        links.append({
-                            "source": n_id,
-                            "target": m_id,
-                            "type": record["rel_type"],
-                            "properties": {k: str(v) for k, v in r_props.items()},
-                        })
-            return {"nodes": list(nodes.values()), "links": links}
-
-    def get_subscription_profile(self, user_name: str = "Neel") -> list[dict]:
+            result = await session.run(CYPHER_GRAPH_DATA)
+            return await _collect_graph(result)
+
+    async def get_graph_counts(self) -> tuple[int, int]:
+        """(nodes, relationships) in the get_graph_data() view, without shipping the graph."""
+        if not self.available:
+            return 0, 0
+        async with self.driver.session() as session:
+            record = await session.execute_read(_run_single, CYPHER_GRAPH_COUNTS)
+            if record is None:
+                return 0, 0
+            return record["nodes"], record["relationships"] or 0
+
+    async def get_subscription_profile(self, user_name: str = "Neel") -> list[dict]:
         """
         Return all active subscriptions for a user from the knowledge graph.
         Each entry: {service, service_type, monthly_cost, previous_cost, since, status}
@@ -161,15 +272,8 @@ class Neo4jService:
         if not self.available:
             return []
         try:
-            with self.driver.session() as session:
-                result = session.run(
-                    "MATCH (p:Person {name: $user})-[r:SUBSCRIBES_TO]->(s:Service) "
-                    "WHERE r.status = 'active' "
-                    "RETURN s.name AS service, s.type AS service_type, "
-                    "       s.monthlyRate AS monthly_cost, s.previousRate AS previous_cost, "
-                    "       r.since AS since",
-                    user=user_name,
-                )
+            async with self.driver.session() as session:
+                result = await session.run(CYPHER_SUBSCRIPTION_PROFILE, user=user_name)
                 return [
                     {
                         "service": rec["service"],
@@ -178,25 +282,17 @@ class Neo4jService:
                         "previous_cost": float(rec["previous_cost"]) if rec["previous_cost"] else None,
                         "since": rec["since"],
                     }
-                    for rec in result
+                    async for rec in result
                 ]
         except Exception as e:
             logger.warning("get_subscription_profile failed: %s", e)
             return []
 
-    def update_status(self, service_name: str, details: str) -> dict:
+    async def update_status(self, service_name: str, details: str) -> dict:
         if not self.available:
             return {"status": "neo4j_unavailable"}
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    "MATCH (s:Service {name: $name}) "
-                    "SET s.lastUpdate = datetime(), s.details = $details "
-                    "RETURN s.name AS service",
-                    name=service_name,
-                    details=details,
-                )
-            )
+        async with self.driver.session() as session:
+            await session.execute_write(_run, CYPHER_UPDATE_STATUS, name=service_name, details=details)
             return {"service": service_name, "updated": True}
 
 
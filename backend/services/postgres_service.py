@@ -6,7 +6,6 @@ Postgres Call Log Service (Render Postgres)
 """
 
 import logging
-import os
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -17,7 +16,15 @@ logger = logging.getLogger(__name__)
 # Connection pool (lazy-init)
 _pool = None
 
-DATABASE_URL = os.getenv("DATABASE_URL", "")
+DATABASE_URL = config.DATABASE_URL
+
+# Pool sizing: asyncpg opens min_size connections inside create_pool, so startup
+# pays the TCP/TLS handshakes rather than the first logged call. Kept small for
+# Render's per-database connection cap; writes here are one short INSERT per call.
+_POOL_MIN_SIZE = 2
+_POOL_MAX_SIZE = 5
+# Fail a stuck statement instead of holding a pooled connection indefinitely
+_COMMAND_TIMEOUT = 10
 
 
 async def connect():
@@ -28,7 +35,12 @@ async def connect():
         return
     try:
         import asyncpg
-        _pool = await asyncpg.create_pool(DATABASE_URL, min_size=1, max_size=3)
+        _pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=_POOL_MIN_SIZE,
+            max_size=_POOL_MAX_SIZE,
+            command_timeout=_COMMAND_TIMEOUT,
+        )
         await _create_tables()
         logger.info("Postgres connected — call logging enabled")
     except ImportError:
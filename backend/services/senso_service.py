@@ -6,64 +6,128 @@ Senso Context OS Integration
 - Classify threats via triggers
 """
 
+import asyncio
 import logging
+import time
+from typing import Optional
 
 import httpx
 
 import config
+from services import http_retry
 
 logger = logging.getLogger(__name__)
 
+# Settings are frozen at import, so whether Senso is configured is decided once
+AVAILABLE = bool(config.SENSO_API_KEY)
 
-def _headers() -> dict:
-    return {
-        "X-API-Key": config.SENSO_API_KEY,
-        "Content-Type": "application/json",
-    }
+# Classification by anomaly text — billing detections repeat across scans
+_CLASSIFY_CACHE_MAX = 256
+_classify_cache: dict[str, str] = {}
+# search_knowledge results: key -> (expires_at, answer). The generation is part of the key,
+# so an ingest invalidates every cached answer without walking the cache.
+_SEARCH_TTL = 300.0
+_SEARCH_CACHE_MAX = 1024
+_search_cache: dict[tuple, tuple[float, str]] = {}
+_search_inflight: dict[tuple, asyncio.Task] = {}
+_search_generation = 0
+# Whether /triggers accepts {"texts": [...]}; None until the first multi-text batch finds out
+_batch_triggers: Optional[bool] = None
 
+# Long-lived client (lazy) — reuse pooled connections instead of a TLS handshake per call
+_client: Optional[httpx.AsyncClient] = None
 
-@property
-def available() -> bool:
-    return bool(config.SENSO_API_KEY)
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        # Base URL and auth headers are fixed for the process — set once on the client
+        _client = httpx.AsyncClient(
+            base_url=config.SENSO_BASE_URL,
+            headers={
+                "X-API-Key": config.SENSO_API_KEY,
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _client
+
+
+async def close():
+    """Close the shared HTTP client (called from app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
 
 
 async def ingest_content(title: str, text: str) -> dict:
     """Ingest compliance docs / resolution scripts into Senso."""
-    if not config.SENSO_API_KEY:
+    global _search_generation
+    if not AVAILABLE:
         return {"status": "senso_unavailable"}
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                f"{config.SENSO_BASE_URL}/content/raw",
-                headers=_headers(),
-                json={"title": title, "summary": title, "text": text},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await http_retry.request(
+            _get_client(),
+            "POST",
+            "/content/raw",
+            idempotent=False,
+            json={"title": title, "summary": title, "text": text},
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        # New knowledge — cached search answers may be stale
+        _search_generation += 1
+        return resp.json()
     except Exception as e:
         logger.error("Senso ingest failed: %s", e)
         return {"error": str(e)}
 
 
 async def search_knowledge(query: str, max_results: int = 3) -> str:
-    """Query Senso for verified, grounded context. Returns single-line string for Vapi."""
-    if not config.SENSO_API_KEY:
+    """Query Senso for verified, grounded context. Returns single-line string for Vapi.
+
+    Answers are cached for a few minutes and concurrent identical queries share one request.
+    """
+    if not AVAILABLE:
         return ""
+    key = (_search_generation, query.strip().lower(), max_results)
+    hit = _search_cache.get(key)
+    if hit and hit[0] > time.monotonic():
+        return hit[1]
+
+    inflight = _search_inflight.get(key)
+    if inflight is None:
+        inflight = asyncio.create_task(_search(query, max_results))
+        _search_inflight[key] = inflight
+        inflight.add_done_callback(lambda _: _search_inflight.pop(key, None))
+    answer = await asyncio.shield(inflight)
+
+    # Empty means Senso had nothing or the call failed — don't cache either
+    if answer:
+        if len(_search_cache) >= _SEARCH_CACHE_MAX:
+            _search_cache.pop(next(iter(_search_cache)))
+        _search_cache[key] = (time.monotonic() + _SEARCH_TTL, answer)
+    return answer
+
+
+async def _search(query: str, max_results: int) -> str:
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                f"{config.SENSO_BASE_URL}/search",
-                headers=_headers(),
-                json={"query": query, "max_results": max_results},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            answer = data.get("answer", "")
-            sources = data.get("results", [])
-            if sources:
-                citations = " | ".join(s.get("title", "") for s in sources[:2])
-                answer = f"{answer} [Sources: {citations}]"
-            return answer.replace("\n", " ").strip()
+        resp = await http_retry.request(
+            _get_client(),
+            "POST",
+            "/search",
+            json={"query": query, "max_results": max_results},
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        answer = data.get("answer", "")
+        sources = data.get("results", [])
+        if sources:
+            citations = " | ".join(s.get("title", "") for s in sources[:2])
+            answer = f"{answer} [Sources: {citations}]"
+        return answer.replace("\n", " ").strip()
     except Exception as e:
         logger.error("Senso search failed: %s", e)
         return ""
@@ -71,7 +135,7 @@ async def search_knowledge(query: str, max_results: int = 3) -> str:
 
 async def generate_script(company: str, action: str, context: str = "") -> str:
     """Generate a call script grounded in ingested knowledge."""
-    if not config.SENSO_API_KEY:
+    if not AVAILABLE:
         return ""
     instructions = (
         f"Generate a professional phone call script for a representative calling "
@@ -81,18 +145,19 @@ async def generate_script(company: str, action: str, context: str = "") -> str:
         f"Additional context: {context}"
     )
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                f"{config.SENSO_BASE_URL}/generate",
-                headers=_headers(),
-                json={
-                    "content_type": "call_script",
-                    "instructions": instructions,
-                    "max_results": 3,
-                },
-            )
-            resp.raise_for_status()
-            return resp.json().get("content", "")
+        resp = await http_retry.request(
+            _get_client(),
+            "POST",
+            "/generate",
+            json={
+                "content_type": "call_script",
+                "instructions": instructions,
+                "max_results": 3,
+            },
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        return resp.json().get("content", "")
     except Exception as e:
         logger.error("Senso generate failed: %s", e)
         return ""
@@ -100,25 +165,79 @@ async def generate_script(company: str, action: str, context: str = "") -> str:
 
 async def classify_threat(text: str) -> str:
     """Use Senso triggers to classify threat type."""
-    if not config.SENSO_API_KEY:
+    if not AVAILABLE:
         return "unknown"
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                f"{config.SENSO_BASE_URL}/triggers",
-                headers=_headers(),
-                json={"text": text},
-            )
-            resp.raise_for_status()
-            return resp.json().get("classification", "unknown")
+        resp = await http_retry.request(
+            _get_client(),
+            "POST",
+            "/triggers",
+            json={"text": text},
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json().get("classification", "unknown")
     except Exception as e:
         logger.error("Senso classify failed: %s", e)
         return "unknown"
 
 
+async def classify_threats_batch(texts: list[str]) -> list[str]:
+    """Classify several texts at once; results line up with the input order.
+
+    Uncached texts go to /triggers in a single request when the endpoint accepts
+    a list; otherwise they are classified concurrently, one request each.
+    Successful labels are cached for later scans.
+    """
+    labels = {t: _classify_cache[t] for t in texts if t in _classify_cache}
+    pending = [t for t in dict.fromkeys(texts) if t not in labels]
+    if pending:
+        fresh = await _classify_many(pending) if len(pending) > 1 else None
+        if fresh is None:
+            fresh = await asyncio.gather(*(classify_threat(t) for t in pending))
+        if len(_classify_cache) + len(pending) > _CLASSIFY_CACHE_MAX:
+            _classify_cache.clear()
+        for text, label in zip(pending, fresh):
+            labels[text] = label
+            # Don't pin failures — "unknown" is also the error fallback
+            if label != "unknown":
+                _classify_cache[text] = label
+    return [labels[t] for t in texts]
+
+
+async def _classify_many(texts: list[str]) -> Optional[list[str]]:
+    """One /triggers request for several texts; None if batching isn't available."""
+    global _batch_triggers
+    if not AVAILABLE or _batch_triggers is False:
+        return None
+    try:
+        resp = await http_retry.request(
+            _get_client(),
+            "POST",
+            "/triggers",
+            json={"texts": texts},
+            timeout=10.0,
+        )
+        if resp.is_client_error:
+            # Endpoint rejects list input — stop trying and classify one by one from now on
+            logger.info("Senso /triggers has no batch support (%s) — using per-text requests", resp.status_code)
+            _batch_triggers = False
+            return None
+        resp.raise_for_status()
+        labels = resp.json().get("classifications")
+        if not isinstance(labels, list) or len(labels) != len(texts):
+            _batch_triggers = False
+            return None
+        _batch_triggers = True
+        return [label or "unknown" for label in labels]
+    except Exception as e:
+        logger.error("Senso batch classify failed: %s", e)
+        return None
+
+
 async def seed_compliance_docs():
     """Ingest common compliance/negotiation docs on startup."""
-    if not config.SENSO_API_KEY:
+    if not AVAILABLE:
         logger.warning("SENSO_API_KEY not set — Context OS features disabled")
         return
 
@@ -164,6 +283,7 @@ async def seed_compliance_docs():
         },
     ]
 
-    for doc in docs:
-        result = await ingest_content(doc["title"], doc["text"])
+    # Independent uploads — ingest concurrently (ingest_content never raises)
+    results = await asyncio.gather(*(ingest_content(doc["title"], doc["text"]) for doc in docs))
+    for doc, result in zip(docs, results):
         logger.info("Senso ingested '%s': %s", doc["title"], result.get("status", result))
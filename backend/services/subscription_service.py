@@ -50,7 +50,7 @@ _FALLBACK_SUBSCRIPTIONS: list[dict] = [
 ]
 
 
-def build_subscription_context(user_name: str = "Neel") -> dict:
+async def build_subscription_context(user_name: str = "Neel") -> dict:
     """
     Returns the full billing context used in two places:
       1. Injected into the Vapi user-consult system prompt at call creation.
@@ -58,7 +58,7 @@ def build_subscription_context(user_name: str = "Neel") -> dict:
 
     Reads live rates from Neo4j. Falls back to hardcoded data if unavailable.
     """
-    raw = neo4j_service.get_subscription_profile(user_name)
+    raw = await neo4j_service.get_subscription_profile(user_name)
     source = "neo4j" if raw else "fallback"
     if not raw:
         raw = _FALLBACK_SUBSCRIPTIONS
@@ -138,9 +138,9 @@ def _build_summary_text(
     return "\n".join(lines)
 
 
-def get_subscription_by_service(service_name: str) -> dict | None:
+async def get_subscription_by_service(service_name: str) -> dict | None:
     """Look up enriched subscription metadata by (case-insensitive) service name."""
-    ctx = build_subscription_context()
+    ctx = await build_subscription_context()
     name_lower = service_name.lower()
     for s in ctx["subscriptions"]:
         if s["service"].lower() in name_lower or name_lower in s["service"].lower():
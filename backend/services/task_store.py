@@ -1,8 +1,13 @@
 import asyncio
-import uuid
+import secrets
 from typing import Optional
 
-from models.schemas import Task, TaskCreate, TaskStatus, SSEEvent, SSEEventType, ConfirmedAction
+import orjson
+
+from models.schemas import Task, TaskCreate, TaskAction, TaskStatus, SSEEvent, SSEEventType, ConfirmedAction
+
+# Per-subscriber SSE buffer; a slow dashboard loses its oldest events rather than growing memory
+SSE_QUEUE_SIZE = 256
 
 
 class TaskStore:
@@ -10,16 +15,32 @@ class TaskStore:
 
     def __init__(self):
         self.tasks: dict[str, Task] = {}
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+        # call_id -> task, kept in sync by create_task/update_task (webhooks look up by call_id)
+        self._by_call_id: dict[str, Task] = {}
+        # Ids of tasks currently in CALLING, in the order they started calling (insertion-ordered set)
+        self._calling_ids: dict[str, None] = {}
+        # Same for PENDING, in creation order (demo_run takes the first one)
+        self._pending_ids: dict[str, None] = {}
+        # Snapshot for list_tasks(); rebuilt only when tasks are added or removed
+        self._task_list: Optional[tuple[Task, ...]] = None
+        # Bumped on every create/update/reset, so derived caches can tell they're stale
+        self.version = 0
+        # Running aggregates for /api/demo/stats, adjusted as tasks are added or change
+        self._stats = _empty_stats()
+        # task_id -> serialized model_dump(), built on first read and dropped by update_task
+        self._dumps: dict[str, orjson.Fragment] = {}
+        # One bounded queue per connected SSE client — every client sees every event
+        self._subscribers: set[asyncio.Queue] = set()
+        self.dropped_events = 0
         self.confirmed_actions: list[ConfirmedAction] = []
         self._seed_demo_tasks()
 
     def _seed_demo_tasks(self):
-        """Pre-load demo scenarios so dashboard has data on startup."""
+        """Pre-load demo scenarios so dashboard has data on startup (trusted literals, no validation)."""
         demo_tasks = [
-            TaskCreate(
+            TaskCreate.model_construct(
                 company="Comcast",
-                action="negotiate_rate",
+                action=TaskAction.NEGOTIATE_RATE,
                 phone_number="+18005551234",
                 service_type="internet",
                 current_rate=85.0,
@@ -27,9 +48,9 @@ class TaskStore:
                 user_name="Neel",
                 notes="Bill increased from $55 to $85. Negotiate back down.",
             ),
-            TaskCreate(
+            TaskCreate.model_construct(
                 company="Planet Fitness",
-                action="cancel_service",
+                action=TaskAction.CANCEL_SERVICE,
                 phone_number="+18005555678",
                 service_type="gym",
                 current_rate=25.0,
@@ -40,37 +61,166 @@ class TaskStore:
         for tc in demo_tasks:
             self.create_task(tc)
 
+    def reset(self):
+        """Drop all tasks and re-seed the demo scenarios."""
+        # Fresh containers rather than .clear(): anything still holding the old dict or
+        # list_tasks() snapshot keeps a consistent (pre-reset) view
+        self.tasks = {}
+        self._by_call_id = {}
+        self._calling_ids = {}
+        self._pending_ids = {}
+        self._task_list = None
+        self._stats = _empty_stats()
+        self._dumps = {}
+        self.version += 1
+        self._seed_demo_tasks()
+
     def create_task(self, task_create: TaskCreate) -> Task:
-        task_id = f"task_{uuid.uuid4().hex[:8]}"
-        task = Task(id=task_id, **task_create.model_dump())
+        task_id = f"task_{secrets.token_hex(4)}"
+        # task_create is already validated (request body or trusted internal input) — don't re-validate
+        task = Task.model_construct(id=task_id, **task_create.__dict__)
         self.tasks[task_id] = task
+        self._task_list = None
+        self.version += 1
+        if task.call_id:
+            self._by_call_id[task.call_id] = task
+        if task.status == TaskStatus.CALLING:
+            self._calling_ids[task_id] = None
+        elif task.status == TaskStatus.PENDING:
+            self._pending_ids[task_id] = None
+        self._tally(_contribution(task.status, task.savings, task.call_id), 1)
         return task
 
+    def create_tasks(self, task_creates: list[TaskCreate]) -> list[Task]:
+        """create_task for several at once (one list_tasks snapshot rebuild afterwards)."""
+        return [self.create_task(tc) for tc in task_creates]
+
     def get_task(self, task_id: str) -> Optional[Task]:
         return self.tasks.get(task_id)
 
-    def list_tasks(self) -> list[Task]:
-        return list(self.tasks.values())
+    def get_task_by_call_id(self, call_id: str) -> Optional[Task]:
+        return self._by_call_id.get(call_id)
+
+    def get_first_calling_task(self) -> Optional[Task]:
+        """Earliest task still in CALLING, or None."""
+        for task_id in self._calling_ids:
+            return self.tasks[task_id]
+        return None
+
+    def get_first_pending_task(self) -> Optional[Task]:
+        """Earliest-created task still in PENDING, or None."""
+        for task_id in self._pending_ids:
+            return self.tasks[task_id]
+        return None
+
+    def get_first_task(self) -> Optional[Task]:
+        return next(iter(self.tasks.values()), None)
+
+    def list_tasks(self) -> tuple[Task, ...]:
+        # Tasks are updated in place, so the snapshot stays valid across update_task
+        if self._task_list is None:
+            self._task_list = tuple(self.tasks.values())
+        return self._task_list
 
     def update_task(self, task_id: str, **kwargs) -> Optional[Task]:
+        """Apply fields in place; returns the (same, now updated) task, or None if unknown."""
         task = self.tasks.get(task_id)
         if not task:
             return None
+        # Work out the stats change before touching anything, so a bad value
+        # (e.g. non-numeric savings) raises with the task and counters intact
+        counted = not _STAT_FIELDS.isdisjoint(kwargs)
+        if counted:
+            old = _contribution(task.status, task.savings, task.call_id)
+            new = _contribution(
+                kwargs.get("status", task.status),
+                kwargs.get("savings", task.savings),
+                kwargs.get("call_id", task.call_id),
+            )
+        if "call_id" in kwargs and kwargs["call_id"] != task.call_id:
+            if task.call_id and self._by_call_id.get(task.call_id) is task:
+                del self._by_call_id[task.call_id]
+            if kwargs["call_id"]:
+                self._by_call_id[kwargs["call_id"]] = task
+        if "status" in kwargs:
+            if kwargs["status"] == TaskStatus.CALLING:
+                self._calling_ids.setdefault(task_id, None)
+            else:
+                self._calling_ids.pop(task_id, None)
+            if kwargs["status"] == TaskStatus.PENDING:
+                self._pending_ids.setdefault(task_id, None)
+            else:
+                self._pending_ids.pop(task_id, None)
         for key, value in kwargs.items():
             if hasattr(task, key):
                 setattr(task, key, value)
+        # Take the task's old contribution out of the stats and put the new one in
+        if counted:
+            self._tally(old, -1)
+            self._tally(new, 1)
+        self._dumps.pop(task_id, None)
+        self.version += 1
         return task
 
+    def _tally(self, contribution: tuple, sign: int):
+        bucket, cents, called = contribution
+        stats = self._stats
+        if bucket is not None:
+            stats[bucket] += sign
+        stats["savings_cents"] += sign * cents
+        if called:
+            stats["calls_made"] += sign
+
+    def dump_task(self, task: Task) -> orjson.Fragment:
+        """
+        The task's JSON, serialized once per change. Drop it anywhere model_dump() output
+        would go into orjson (ORJSONResponse, encode_sse) and it is embedded as-is.
+        """
+        dump = self._dumps.get(task.id)
+        if dump is None:
+            dump = self._dumps[task.id] = orjson.Fragment(orjson.dumps(task.model_dump()))
+        return dump
+
+    def stats_snapshot(self) -> dict:
+        """Task counters for the stats ribbon, without scanning the tasks."""
+        stats = dict(self._stats)
+        cents = stats.pop("savings_cents")
+        stats["monthly_savings"] = cents // 100 if cents % 100 == 0 else cents / 100
+        stats["total"] = len(self.tasks)
+        return stats
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register an SSE client; pair with unsubscribe() when it disconnects."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _publish(self, frame: bytes):
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped_events += 1
+            queue.put_nowait(frame)
+
     async def push_event(self, event: SSEEvent):
-        """Push event to SSE queue for dashboard."""
-        await self.event_queue.put(event)
+        """Push event to every connected SSE client (encoded once here, not once per client)."""
+        if self._subscribers:
+            self._publish(encode_sse(event.type, event.data))
+
+    async def push_sse_bytes(self, frame: bytes):
+        """Push a pre-encoded SSE frame (see encode_sse); the stream sends it as-is."""
+        self._publish(frame)
+
+    def publish_frame(self, frame: bytes):
+        """Synchronous push_sse_bytes, for loop callbacks (call_soon / call_later)."""
+        self._publish(frame)
 
     async def push_task_update(self, task: Task):
         """Convenience: push a task update event."""
-        await self.push_event(SSEEvent(
-            type=SSEEventType.TASK_UPDATED,
-            data=task.model_dump(),
-        ))
+        await self.push_sse_bytes(encode_sse(SSEEventType.TASK_UPDATED, self.dump_task(task)))
 
     def add_confirmed_action(self, action: ConfirmedAction):
         self.confirmed_actions.append(action)
@@ -82,5 +232,33 @@ class TaskStore:
         self.confirmed_actions.clear()
 
 
+# update_task fields that feed the running stats
+_STAT_FIELDS = frozenset(("status", "savings", "call_id"))
+
+
+def _contribution(status, savings, call_id) -> tuple[Optional[str], int, bool]:
+    """What one task adds to the stats: (status counter, savings in cents, has a call)."""
+    if status == TaskStatus.COMPLETED:
+        # Whole cents, so adding and removing a task's savings never leaves float residue
+        return "completed", round((savings or 0) * 100), call_id is not None
+    if status == TaskStatus.PENDING:
+        bucket = "pending"
+    elif status == TaskStatus.RESEARCHING or status == TaskStatus.CALLING:
+        bucket = "in_progress"
+    else:
+        bucket = None
+    return bucket, 0, call_id is not None
+
+
+def _empty_stats() -> dict:
+    return {"completed": 0, "pending": 0, "in_progress": 0, "calls_made": 0, "savings_cents": 0}
+
+
+def encode_sse(event_type: SSEEventType, data) -> bytes:
+    """Build the same frame the SSE stream emits for an SSEEvent, without the model round-trip."""
+    payload = orjson.dumps({"type": event_type.value, "data": data})
+    return b"event: " + event_type.value.encode() + b"\ndata: " + payload + b"\n\n"
+
+
 # Singleton
 store = TaskStore()
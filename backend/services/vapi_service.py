@@ -1,13 +1,42 @@
+import asyncio
 import logging
+from typing import Optional
 
 import httpx
+import orjson
 
 import config
+from services import http_retry
 
 logger = logging.getLogger(__name__)
 
 VAPI_BASE = "https://api.vapi.ai"
 
+# Long-lived client (lazy) — reuse pooled connections instead of a TLS handshake per call
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {config.VAPI_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _client
+
+
+async def close():
+    """Close the shared HTTP client (called from app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+
 # ── Inline tool schemas for the user-consult assistant ──────
 _SUBSCRIPTION_ANALYSIS_TOOL = {
     "type": "function",
@@ -126,27 +155,25 @@ async def trigger_user_consult_call(
         },
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.post(
-                f"{VAPI_BASE}/call",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {config.VAPI_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                timeout=15.0,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            logger.info("User consult call triggered: %s → %s", task_id, data.get("id"))
-            return data
-        except httpx.HTTPStatusError as e:
-            logger.error("Vapi user consult call failed: %s %s", e.response.status_code, e.response.text)
-            return {"error": e.response.text}
-        except Exception as e:
-            logger.error("Vapi user consult call error: %s", e)
-            return {"error": str(e)}
+    try:
+        resp = await http_retry.request(
+            _get_client(),
+            "POST",
+            f"{VAPI_BASE}/call",
+            idempotent=False,
+            content=orjson.dumps(payload),
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        logger.info("User consult call triggered: %s → %s", task_id, data.get("id"))
+        return data
+    except httpx.HTTPStatusError as e:
+        logger.error("Vapi user consult call failed: %s %s", e.response.status_code, e.response.text)
+        return {"error": e.response.text}
+    except Exception as e:
+        logger.error("Vapi user consult call error: %s", e)
+        return {"error": str(e)}
 
 
 async def trigger_outbound_call(
@@ -185,27 +212,25 @@ async def trigger_outbound_call(
         },
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.post(
-                f"{VAPI_BASE}/call/phone",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {config.VAPI_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                timeout=15.0,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            logger.info("Outbound call triggered: %s", data.get("id"))
-            return data
-        except httpx.HTTPStatusError as e:
-            logger.error("Vapi call failed: %s %s", e.response.status_code, e.response.text)
-            return {"error": e.response.text}
-        except Exception as e:
-            logger.error("Vapi call error: %s", e)
-            return {"error": str(e)}
+    try:
+        resp = await http_retry.request(
+            _get_client(),
+            "POST",
+            f"{VAPI_BASE}/call/phone",
+            idempotent=False,
+            content=orjson.dumps(payload),
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        logger.info("Outbound call triggered: %s", data.get("id"))
+        return data
+    except httpx.HTTPStatusError as e:
+        logger.error("Vapi call failed: %s %s", e.response.status_code, e.response.text)
+        return {"error": e.response.text}
+    except Exception as e:
+        logger.error("Vapi call error: %s", e)
+        return {"error": str(e)}
 
 
 async def update_assistant_server_url(new_url: str) -> dict:
@@ -213,22 +238,19 @@ async def update_assistant_server_url(new_url: str) -> dict:
     if not config.VAPI_API_KEY:
         return {"error": "VAPI_API_KEY not set"}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.patch(
-                f"{VAPI_BASE}/assistant/{config.VAPI_ASSISTANT_ID}",
-                json={"serverUrl": f"{new_url}/api/vapi/webhook"},
-                headers={
-                    "Authorization": f"Bearer {config.VAPI_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                timeout=10.0,
-            )
-            resp.raise_for_status()
-            return resp.json()
-        except Exception as e:
-            logger.error("Failed to update assistant URL: %s", e)
-            return {"error": str(e)}
+    try:
+        resp = await http_retry.request(
+            _get_client(),
+            "PATCH",
+            f"{VAPI_BASE}/assistant/{config.VAPI_ASSISTANT_ID}",
+            content=orjson.dumps({"serverUrl": f"{new_url}/api/vapi/webhook"}),
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
+    except Exception as e:
+        logger.error("Failed to update assistant URL: %s", e)
+        return {"error": str(e)}
 
 
 async def update_tool_server_urls(new_url: str) -> list[dict]:
@@ -237,21 +259,21 @@ async def update_tool_server_urls(new_url: str) -> list[dict]:
     if not tool_ids:
         logger.warning("VAPI_TOOL_IDS not set — skipping tool URL updates")
         return []
-    results = []
-    async with httpx.AsyncClient() as client:
-        for tool_id in tool_ids:
-            try:
-                resp = await client.patch(
-                    f"{VAPI_BASE}/tool/{tool_id}",
-                    json={"server": {"url": f"{new_url}/api/vapi/tool-call"}},
-                    headers={
-                        "Authorization": f"Bearer {config.VAPI_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=10.0,
-                )
-                resp.raise_for_status()
-                results.append({"tool_id": tool_id, "status": "updated"})
-            except Exception as e:
-                results.append({"tool_id": tool_id, "error": str(e)})
-    return results
+    # Same body for every tool — encode it once
+    body = orjson.dumps({"server": {"url": f"{new_url}/api/vapi/tool-call"}})
+
+    async def _patch_tool(tool_id: str) -> dict:
+        try:
+            resp = await http_retry.request(
+                _get_client(),
+                "PATCH",
+                f"{VAPI_BASE}/tool/{tool_id}",
+                content=body,
+                timeout=10.0,
+            )
+            resp.raise_for_status()
+            return {"tool_id": tool_id, "status": "updated"}
+        except Exception as e:
+            return {"tool_id": tool_id, "error": str(e)}
+
+    return list(await asyncio.gather(*(_patch_tool(tool_id) for tool_id in tool_ids)))
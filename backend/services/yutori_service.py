@@ -8,6 +8,7 @@ NOTE: Get API credentials from Dhruv Batra at hackathon.
 Yutori is early stage — API details will be provided on-site.
 """
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -104,7 +105,7 @@ async def _fallback_monitor(provider: str, monitor_type: str) -> dict:
     }
     query = queries.get(monitor_type, f"{provider} {monitor_type} 2025")
 
-    result = tavily_service.search(query)
+    result = await asyncio.to_thread(tavily_service.search, query)
     return {
         "source": "tavily_fallback",
         "provider": provider,
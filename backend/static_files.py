@@ -0,0 +1,177 @@
+"""
+Dashboard file serving for the built SPA in backend/static.
+
+Files are stat'd once at startup (small ones read into memory) and served by
+pure ASGI apps with a precomputed ETag; a matching If-None-Match gets a
+bodiless 304. Redeploys replace the files, so the startup snapshot stays valid.
+"""
+
+import gzip
+import mimetypes
+import os
+from pathlib import Path
+
+from starlette.responses import FileResponse
+
+# Optional — brotli isn't a hard dependency; gzip (stdlib) is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies at or under this size are kept in memory and sent in a single message
+_PRELOAD_MAX = 64 * 1024
+
+# index.html names the hashed asset bundles, so browsers must revalidate it every load
+CACHE_REVALIDATE = "no-cache"
+# Unhashed images (logo, demo bill) — may change between deploys
+CACHE_DAY = "public, max-age=86400"
+# Vite asset filenames carry a content hash — a new build means a new URL
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+
+_NOT_FOUND_BODY = b"Not Found"
+
+
+def _etag(size: int, mtime: float) -> bytes:
+    return f'W/"{size:x}-{int(mtime):x}"'.encode()
+
+
+def _header(scope, name: bytes) -> bytes:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return b""
+
+
+def _not_modified(scope, etag: bytes) -> bool:
+    if_none_match = _header(scope, b"if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == b"*" or etag in (t.strip() for t in if_none_match.split(b","))
+
+
+async def _send_304(send, etag: bytes, cache_control: bytes):
+    await send({
+        "type": "http.response.start",
+        "status": 304,
+        "headers": [(b"etag", etag), (b"cache-control", cache_control)],
+    })
+    await send({"type": "http.response.body", "body": b""})
+
+
+class CachedFile:
+    """Pure ASGI app serving one file with a startup-computed ETag."""
+
+    def __init__(self, path: Path, cache_control: str):
+        self.path = path
+        self.stat = path.stat()
+        self.etag = _etag(self.stat.st_size, self.stat.st_mtime)
+        self.cache_control = cache_control.encode()
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.body = path.read_bytes() if self.stat.st_size <= _PRELOAD_MAX else None
+        self._headers = [
+            (b"content-type", self.media_type.encode()),
+            (b"etag", self.etag),
+            (b"cache-control", self.cache_control),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if _not_modified(scope, self.etag):
+            await _send_304(send, self.etag, self.cache_control)
+            return
+        if self.body is None:
+            # Large file: stream it (sendfile where available) without re-stat'ing
+            response = FileResponse(
+                self.path,
+                stat_result=self.stat,
+                media_type=self.media_type,
+                headers={"etag": self.etag.decode(), "cache-control": self.cache_control.decode()},
+            )
+            await response(scope, receive, send)
+            return
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": self._headers + [(b"content-length", str(len(self.body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else self.body})
+
+
+def _accepted_encodings(scope) -> set[bytes]:
+    """Codings the client accepts, ignoring any explicitly refused with q=0."""
+    accepted = set()
+    for part in _header(scope, b"accept-encoding").split(b","):
+        coding, _, params = part.strip().partition(b";")
+        if params.replace(b" ", b"") not in (b"q=0", b"q=0.0", b"q=0.00", b"q=0.000"):
+            accepted.add(coding.strip())
+    return accepted
+
+
+class PrecompressedAssets:
+    """
+    Pure ASGI app for the hashed build bundles under /assets.
+
+    Every file is read and compressed once at startup (gzip, plus brotli when
+    installed); requests are served from memory with the best encoding the
+    client accepts — no disk I/O or per-request compression.
+    """
+
+    def __init__(self, directory: Path):
+        self.files: dict[str, dict] = {}
+        for root, _dirs, names in os.walk(directory):
+            for name in names:
+                full = Path(root) / name
+                data = full.read_bytes()
+                st = full.stat()
+                variants = {b"identity": data}
+                # Only keep a compressed body if it actually saves bytes (not for images)
+                gz = gzip.compress(data, 9)
+                if len(gz) < len(data):
+                    variants[b"gzip"] = gz
+                if brotli is not None:
+                    br = brotli.compress(data)
+                    if len(br) < len(data):
+                        variants[b"br"] = br
+                self.files["/" + full.relative_to(directory).as_posix()] = {
+                    "variants": variants,
+                    "etag": _etag(st.st_size, st.st_mtime),
+                    "content_type": (mimetypes.guess_type(name)[0] or "application/octet-stream").encode(),
+                }
+        self.cache_control = CACHE_IMMUTABLE.encode()
+
+    async def __call__(self, scope, receive, send):
+        # Mounted apps see the prefix in root_path; older Starlette also strips it from path
+        path = scope["path"]
+        root = scope.get("root_path", "")
+        if root and path.startswith(root):
+            path = path[len(root):]
+        entry = self.files.get(path)
+        if entry is None or scope["method"] not in ("GET", "HEAD"):
+            await send({
+                "type": "http.response.start",
+                "status": 404,
+                "headers": [(b"content-type", b"text/plain"), (b"content-length", str(len(_NOT_FOUND_BODY)).encode())],
+            })
+            await send({"type": "http.response.body", "body": _NOT_FOUND_BODY})
+            return
+
+        etag = entry["etag"]
+        if _not_modified(scope, etag):
+            await _send_304(send, etag, self.cache_control)
+            return
+
+        variants = entry["variants"]
+        accepted = _accepted_encodings(scope) if len(variants) > 1 else ()
+        coding = next((c for c in (b"br", b"gzip") if c in variants and c in accepted), b"identity")
+        body = variants[coding]
+        headers = [
+            (b"content-type", entry["content_type"]),
+            (b"content-length", str(len(body)).encode()),
+            (b"etag", etag),
+            (b"cache-control", self.cache_control),
+            (b"vary", b"accept-encoding"),
+        ]
+        if coding != b"identity":
+            headers.append((b"content-encoding", coding))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
@@ -16,15 +16,13 @@ Usage: python -m worker.monitor
 import asyncio
 import logging
 import os
+import random
 import sys
 import time
 
 # Add parent directory to path so imports work
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
-load_dotenv()
-
 import config
 from services import airbyte_service, overshoot_service, senso_service, tavily_service, gmail_service
 
@@ -34,55 +32,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger("haggle.monitor")
 
-# How often to run the monitoring loop (seconds)
-SCAN_INTERVAL = int(os.getenv("SCAN_INTERVAL", "900"))  # Default: 15 minutes
+# How often to run the monitoring loop (seconds) — SCAN_INTERVAL env var, read by config
+SCAN_INTERVAL = config.SCAN_INTERVAL
+# Random spread (± seconds) so restarted workers don't hit every API on the same beat
+SCAN_JITTER = 30
+
+
+async def _scan_stripe() -> list[dict]:
+    """Stripe billing anomalies, classified via Senso."""
+    if not config.STRIPE_API_KEY:
+        return []
+    logger.info("Checking Stripe for billing anomalies...")
+    try:
+        anomalies = await airbyte_service.detect_billing_anomalies(days=60)
+        classifications = await senso_service.classify_threats_batch([
+            f"{a['merchant']} {a['type']}: ${a.get('old_amount', '?')} -> ${a.get('new_amount', '?')}"
+            for a in anomalies
+        ])
+        for a, classification in zip(anomalies, classifications):
+            a["classification"] = classification
+            a["source"] = "airbyte_stripe"
+        return anomalies
+    except Exception as e:
+        logger.error("Stripe scan failed: %s", e)
+        return []
+
+
+async def _scan_overshoot() -> list[dict]:
+    """Overshoot financial broadcast monitoring."""
+    if not config.OVERSHOOT_API_KEY:
+        return []
+    logger.info("Checking Overshoot for financial broadcast alerts...")
+    try:
+        return await overshoot_service.monitor_broadcast("latest")
+    except Exception as e:
+        logger.error("Overshoot scan failed: %s", e)
+        return []
+
+
+async def _scan_tavily() -> list[dict]:
+    """Tavily web search for financial threats."""
+    if not config.TAVILY_API_KEY:
+        return []
+    logger.info("Checking Tavily for financial news...")
+    try:
+        # Tavily's client is synchronous — keep it off the event loop
+        result = await asyncio.to_thread(
+            tavily_service.search,
+            "subscription price increases rate hikes 2026",
+            max_results=3,
+        )
+        if result and "unavailable" not in result.lower():
+            return [{
+                "source": "tavily_search",
+                "type": "WEB_MENTION",
+                "summary": result[:500],
+            }]
+    except Exception as e:
+        logger.error("Tavily scan failed: %s", e)
+    return []
 
 
 async def run_scan() -> list[dict]:
     """Run a single monitoring scan across all sources."""
-    detections = []
     scan_start = time.time()
 
-    # 1. Stripe billing anomalies
-    if config.STRIPE_API_KEY:
-        logger.info("Checking Stripe for billing anomalies...")
-        try:
-            anomalies = await airbyte_service.detect_billing_anomalies(days=60)
-            for a in anomalies:
-                classification = await senso_service.classify_threat(
-                    f"{a['merchant']} {a['type']}: ${a.get('old_amount', '?')} -> ${a.get('new_amount', '?')}"
-                )
-                a["classification"] = classification
-                a["source"] = "airbyte_stripe"
-                detections.append(a)
-        except Exception as e:
-            logger.error("Stripe scan failed: %s", e)
-
-    # 2. Overshoot financial broadcast monitoring
-    if config.OVERSHOOT_API_KEY:
-        logger.info("Checking Overshoot for financial broadcast alerts...")
-        try:
-            events = await overshoot_service.monitor_broadcast("latest")
-            detections.extend(events)
-        except Exception as e:
-            logger.error("Overshoot scan failed: %s", e)
-
-    # 3. Tavily web search for financial threats
-    if config.TAVILY_API_KEY:
-        logger.info("Checking Tavily for financial news...")
-        try:
-            result = tavily_service.search(
-                "subscription price increases rate hikes 2026",
-                max_results=3,
-            )
-            if result and "unavailable" not in result.lower():
-                detections.append({
-                    "source": "tavily_search",
-                    "type": "WEB_MENTION",
-                    "summary": result[:500],
-                })
-        except Exception as e:
-            logger.error("Tavily scan failed: %s", e)
+    # Sources are independent — scan them concurrently (each one logs and swallows its own errors)
+    stripe, overshoot, tavily = await asyncio.gather(
+        _scan_stripe(), _scan_overshoot(), _scan_tavily(),
+    )
+    detections = stripe + overshoot + tavily
 
     scan_duration = time.time() - scan_start
     logger.info(
@@ -115,7 +134,10 @@ async def main():
     # Seed Senso on first run
     await senso_service.seed_compliance_docs()
 
+    # Deadline-based: a slow scan shortens the following sleep instead of pushing every later scan back
+    jitter = min(SCAN_JITTER, SCAN_INTERVAL / 10)
     while True:
+        next_at = time.monotonic() + SCAN_INTERVAL + random.uniform(-jitter, jitter)
         try:
             detections = await run_scan()
             if detections:
@@ -123,9 +145,16 @@ async def main():
         except Exception as e:
             logger.error("Monitor loop error: %s", e)
 
-        logger.info("Sleeping %ds until next scan...", SCAN_INTERVAL)
-        await asyncio.sleep(SCAN_INTERVAL)
+        delay = max(0.0, next_at - time.monotonic())
+        logger.info("Sleeping %ds until next scan...", delay)
+        await asyncio.sleep(delay)
 
 
 if __name__ == "__main__":
+    # libuv event loop when available (ships with uvicorn[standard]); stock asyncio otherwise
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())